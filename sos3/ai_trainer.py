@@ -3,10 +3,26 @@ from sklearn.ensemble import RandomForestClassifier  # Rastgele orman sınıflan
 from sklearn.tree import DecisionTreeClassifier  # Karar ağacı sınıflandırıcısı (AI modeli)
 from sklearn.model_selection import train_test_split  # Veriyi eğitim/test olarak ayırmak için
 import random  # Rastgele sayı ve seçim işlemleri için
-import pickle  # Python nesnelerini dosyaya kaydetmek/yüklemek için
 import os  # Dosya/dizin işlemleri için
 import time  # Zaman ölçümü için
+import multiprocessing  # Kendi kendine oyunları birden çok süreçte oynatmak için
+import threading  # Parça üretimini özellik çıkarımıyla eşzamanlı yürütmek için
+import queue  # Yazılan parçaları özellik çıkarımına aktarmak için
+import shutil  # Geçici parça klasörünü silmek için
+import tempfile  # Geçici parça klasörü için
+import numpy as np  # Özellik dizileri için
 from datetime import datetime  # Güncel tarih/zaman bilgisi
+from bitboard import BitboardSOSBoard  # Bit maskeli hızlı oyun motoru
+from sos_lines import get_sos_lines, DIRECTIONS, SOS_START, SOS_MIDDLE  # Önceden hesaplanmış SOS üçlü tabloları
+from threat_index import ThreatIndex  # SOS tamamlayan hamlelerin artımlı indeksi
+from game_record import GameRecord  # Sıkıştırılmış oyun kaydı
+from shards import ShardWriter, iter_shard_games  # Diskteki sabit boyutlu oyun parçaları
+from vector_env import VectorSOSEnv  # Binlerce oyunu kilit adımlı oynatan NumPy ortamı
+from zobrist import get_hasher  # Konumların Zobrist anahtarları
+from symmetry import canonicalize_boards, canonical_cells  # Tahtaların 8 simetrisini tek temsilciye indirgeme
+from tablebase import get_tablebase  # Az boş hücreli konumların kesin değerleri
+from opening_book import get_opening_book  # Açılış konumları için önceden hesaplanmış hamleler
+from model_registry import ModelRegistry  # Model dosyalarının indeksi ve saklama politikası
 
 
 # SOS oyun tahtasını ve kurallarını yöneten sınıf
@@ -32,8 +48,21 @@ class SOSBoard:
         # Oyun bitmiş mi? Başlangıçta False
         self.game_over = False
 
-        # Her hamlenin geçmişini tutan liste (AI eğitimi için kullanılır)
-        self.moves_history = []
+        # Her hamlenin geçmişini tutan sıkıştırılmış kayıt (AI eğitimi için kullanılır)
+        self.moves_history = GameRecord(size)
+
+        # Geri alma yığını: (satır, sütun, harf, oyuncu, skor farkı) kayıtları
+        self.undo_stack = []
+
+        # Her hücrenin ait olduğu SOS üçlüleri (boyut başına bir kez hesaplanır)
+        self.lines = get_sos_lines(size)
+
+        # Şu an SOS tamamlayacak (hücre, harf) çiftlerini tutan indeks
+        self.threats = ThreatIndex(size)
+
+        # Tahtanın Zobrist anahtarı (her hamlede tek XOR ile güncellenir)
+        self.hasher = get_hasher(size)
+        self.board_key = 0
 
     def make_move(self, row, col, letter):
         """Verilen hücreye (row, col) 'S' veya 'O' harfini koyarak bir hamle yapar"""
@@ -44,28 +73,20 @@ class SOSBoard:
 
         # Harfi tahtaya yerleştir
         self.board[row][col] = letter
+        self.threats.place(row, col, letter)  # Tehdit indeksini güncelle
+        self.board_key ^= self.hasher.move_key(row, col, letter)  # Zobrist anahtarını güncelle
 
         # Dolu hücre sayısını bir artır
         self.filled_cells += 1
 
-        # Hamle bilgilerini kaydetmek için sözlük oluştur
-        move_data = {
-            "player": self.current_player,  # Hamleyi yapan oyuncu
-            "row": row,  # Hamle yapılan satır
-            "col": col,  # Hamle yapılan sütun
-            "letter": letter,  # Konulan harf ('S' veya 'O')
-            "board_state": [row[:] for row in self.board],  # Tahtanın kopyası (hamle sonrası hali)
-            "scores": self.scores.copy()  # Skorun kopyası (o andaki skor durumu)
-        }
-
         # Konulan harf bir SOS oluşturuyor mu kontrol et
         sos_formed = self.check_sos(row, col)
 
-        # Sonuçları hamle verisine ekle
-        move_data["formed_sos"] = sos_formed
+        # Hamleyi geçmişe ekle (eğitim için kullanılacak; tahta gerektiğinde yeniden kurulur)
+        self.moves_history.append(row, col, letter, sos_formed)
 
-        # Hamleyi geçmişe ekle (eğitim için kullanılacak)
-        self.moves_history.append(move_data)
+        # Hamleyi geri alabilmek için küçük bir kayıt tut
+        self.undo_stack.append((row, col, letter, self.current_player, 1 if sos_formed else 0))
 
         if sos_formed:
             # Eğer bu hamle SOS oluşturduysa, oyuncuya 1 puan ekle
@@ -81,35 +102,46 @@ class SOSBoard:
         # Hamle başarıyla tamamlandıysa True döndür
         return True
 
+    def unmake_move(self):
+        """Son hamleyi geri alır ve (row, col, letter) döndürür; geri alınacak hamle yoksa None"""
+        if not self.undo_stack:
+            return None
+
+        row, col, letter, player, score_delta = self.undo_stack.pop()
+
+        # Hücreyi boşalt ve tehdit indeksini geri al
+        self.board[row][col] = ' '
+        self.threats.remove(row, col)
+        self.board_key ^= self.hasher.move_key(row, col, letter)
+
+        # Sayaçları, skoru ve sırayı hamle öncesine döndür
+        self.filled_cells -= 1
+        self.scores[player] -= score_delta
+        self.current_player = player
+        self.game_over = False
+
+        self.moves_history.pop()  # Hamleyi geçmişten çıkar
+
+        return row, col, letter
+
     def check_sos(self, row, col): #kontrol etme
         """Verilen (row, col) hücresine konulan harf ile bir SOS oluşmuş mu kontrol eder"""
 
         # O hücreye konan harfi al ('S' ya da 'O')
         letter = self.board[row][col]
+        board = self.board
+
+        # Bu hücrenin içinde bulunduğu tüm SOS üçlüleri (önceden hesaplanmış tablo)
+        for role, r1, c1, r2, c2, _ in self.lines[row][col]:
+            if role == SOS_MIDDLE:
+                # Bu 'O' bir SOS'un ortasında mı? (iki yanında 'S' olmalı)
+                if letter == 'O' and board[r1][c1] == 'S' and board[r2][c2] == 'S':
+                    return True
+            # Bu 'S' bir SOS'un başında ya da sonunda mı? (ortada 'O', diğer uçta 'S')
+            elif letter == 'S' and board[r1][c1] == 'O' and board[r2][c2] == 'S':
+                return True
 
-        # SOS desenlerini kontrol etmek için 4 yön:
-        # sağ, aşağı, sağ alt çapraz, sol alt çapraz
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-
-        sos_formed = False  # Başlangıçta SOS oluşmamış kabul edilir
-
-        # Eğer konulan harf 'S' ise: bu 'S' bir SOS'un başında ya da sonunda olabilir
-        if letter == 'S':
-            # SOS'un BAŞI mı? (S O S → bu S en başta)
-            for dr, dc in directions:
-                if (0 <= row + 2 * dr < self.size and
-                        0 <= col + 2 * dc < self.size and
-                        self.board[row + dr][col + dc] == 'O' and  # Ortadaki harf 'O' olmalı
-                        self.board[row + 2 * dr][col + 2 * dc] == 'S'):  # S O S yapısı tamamlanmalı
-                    sos_formed = True
-
-            # SOS'un SONU mu? (S O S → bu S en sonda)
-            for dr, dc in directions:
-                if (0 <= row - 2 * dr < self.size and
-                        0 <= col - 2 * dc < self.size and
-                        self.board[row - dr][col - dc] == 'O' and  # Ortadaki harf 'O' olmalı
-                        self.board[row - 2 * dr][col - 2 * dc] == 'S'):  # S O S yapısı tamamlanmalı
-                    sos_formed = True
+        return False  # SOS oluşmadı
 
     def get_winner(self):
         """Oyun sonunda skorlara göre kazanan oyuncuyu döndürür"""
@@ -166,48 +198,28 @@ class SOSBoard:
 
     def rule_based_move_hard(self):
         """Zor seviye için akıllı hamle yap"""
-        # 1. SOS oluşturabilecek bir hamle olup olmadığını kontrol et
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == ' ':
-                    # S harfi koyarsak SOS olur mu?
-                    self.board[i][j] = 'S'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Denemeyi geri al
-                        return (i, j, 'S')  # S harfi ile SOS yapabildik
-
-                    # O harfi koyarsak SOS olur mu?
-                    self.board[i][j] = 'O'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Denemeyi geri al
-                        return (i, j, 'O')  # O harfi ile SOS yapabildik
+        # 0. Açılıştaysak kitaptaki hamleyi, oyun sonu tablosu varsa kesin en iyi hamleyi oyna
+        book = get_opening_book(self.size)
+        if book is not None and self.filled_cells <= book.max_plies:
+            book_move = book.lookup(self.board)
+            if book_move:
+                return book_move
+
+        tablebase = get_tablebase(self.size)
+        if tablebase is not None and self.total_cells - self.filled_cells <= tablebase.max_empty:
+            table_move = tablebase.best_move(self.board)
+            if table_move:
+                return table_move
 
-                    self.board[i][j] = ' '  # Denemeyi geri al
+        # 1. SOS oluşturabilecek bir hamle olup olmadığını kontrol et
+        # (tehdit indeksinden satır sırasıyla ilk SOS tamamlayan hamle)
+        winning_move = self.threats.first_threat()
+        if winning_move:
+            return winning_move
 
         # 2. Rakibin SOS oluşturmasını engelleyecek bir hamle var mı kontrol et
-        original_player = self.current_player
-        self.current_player = 3 - original_player  # Geçici olarak rakibin sırası
-
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == ' ':
-                    # Rakip S ile SOS oluşturabilir mi?
-                    self.board[i][j] = 'S'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Tahtayı geri al
-                        self.current_player = original_player  # Oyuncuyu geri al
-                        return (i, j, 'S')
-
-                    # Rakip O ile SOS oluşturabilir mi?
-                    self.board[i][j] = 'O'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Tahtayı geri al
-                        self.current_player = original_player  # Oyuncuyu geri al
-                        return (i, j, 'O')
-
-                    self.board[i][j] = ' '  # Tahtayı geri al
-
-        self.current_player = original_player  # Oyuncuyu geri al
+        # SOS oluşumu oyuncuya bağlı olmadığından rakibin tamamlayabileceği hamleler
+        # aynı indekstedir; indeks boşsa engellenecek bir hamle de yoktur.
 
         strategic_moves = []  # Tüm stratejik hamleleri tutacak liste
 
@@ -229,58 +241,67 @@ class SOSBoard:
     def evaluate_strategic_move(self, row, col, letter):
         """Stratejik hamle puanını hesapla"""
         score = 0
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]# Yönler: sağ, aşağı, çaprazlar
-
-        if letter == 'S':
-            for dr, dc in directions:
-                # S-?-? şeklindeki kalıpları kontrol et
-                if (0 <= row + 2*dr < self.size and 0 <= col + 2*dc < self.size):
-                    if self.board[row + dr][col + dc] == 'O' and self.board[row + 2*dr][col + 2*dc] == ' ':
-                        score += 2  # Gerçekleşmeye yakın SOS
-                    elif self.board[row + dr][col + dc] == ' ' and self.board[row + 2*dr][col + 2*dc] == ' ':
-                        score += 1  # Potansiyel SOS
-
-                if (0 <= row - 2*dr < self.size and 0 <= col - 2*dc < self.size):
-                    if self.board[row - dr][col - dc] == 'O' and self.board[row - 2*dr][col - 2*dc] == ' ':
-                        score += 2  # Gerçekleşmeye yakın SOS
-                    elif self.board[row - dr][col - dc] == ' ' and self.board[row - 2*dr][col - 2*dc] == ' ':
-                        score += 1  # Potansiyel SOS
-
-
-        elif letter == 'O':
-            for dr, dc in directions:
+        board = self.board
+
+        for role, r1, c1, r2, c2, _ in self.lines[row][col]:
+            if letter == 'S' and role != SOS_MIDDLE:
+                # S-?-? şeklindeki kalıpları kontrol et (r1, c1 ortadaki, r2, c2 uçtaki hücre)
+                if board[r1][c1] == 'O' and board[r2][c2] == ' ':
+                    score += 2  # Gerçekleşmeye yakın SOS
+                elif board[r1][c1] == ' ' and board[r2][c2] == ' ':
+                    score += 1  # Potansiyel SOS
+
+            elif letter == 'O' and role == SOS_MIDDLE:
                 # O harfi ortadaysa çevresinde S olup olmadığını kontrol et
-                if (0 <= row - dr < self.size and 0 <= col - dc < self.size and
-                    0 <= row + dr < self.size and 0 <= col + dc < self.size):
-                    if self.board[row - dr][col - dc] == 'S' and self.board[row + dr][col + dc] == 'S':
-                        score += 10  # Kesin SOS
-                    elif self.board[row - dr][col - dc] == 'S' and self.board[row + dr][col + dc] == ' ':
-                        score += 3  # SOS ihtimali
-                    elif self.board[row - dr][col - dc] == ' ' and self.board[row + dr][col + dc] == 'S':
-                        score += 3  # SOS ihtimali
-        # Rakibin bu hamleye karşı SOS yapma ihtimalini düş
-        original_player = self.current_player
-        self.current_player = 3 - original_player  # Rakibi aktif yap
-
-        self.board[row][col] = letter  # Geçici olarak hamleyi uygula
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.board[r][c] == ' ':
-                    for test_letter in ['S', 'O']:
-                        self.board[r][c] = test_letter
-                        if self.check_sos(r, c):
-                            score -= 5  # Rakip burada SOS yapabiliyor, puan düş
-                        self.board[r][c] = ' '  # Geri al
-
-        self.board[row][col] = ' '  # Kendi hamleni de geri al
-        self.current_player = original_player  # Oyuncuyu geri getir
+                if board[r1][c1] == 'S' and board[r2][c2] == 'S':
+                    score += 10  # Kesin SOS
+                elif board[r1][c1] == 'S' and board[r2][c2] == ' ':
+                    score += 3  # SOS ihtimali
+                elif board[r1][c1] == ' ' and board[r2][c2] == 'S':
+                    score += 3  # SOS ihtimali
+
+        # Rakibin bu hamleye karşı SOS yapma ihtimalini düş: hamleden sonra rakibin
+        # SOS tamamlayabileceği her (hücre, harf) çifti için 5 puan (sadece bu hücrenin
+        # üçlülerinden hesaplanır, tüm tahta yeniden taranmaz)
+        score -= 5 * self.threats.count_after(row, col, letter)
 
         return score  # Hesaplanan stratejik puanı döndür
 
+
+# Kendi kendine oyunda kullanılabilecek oyun motorları
+ENGINES = {
+    "list": SOSBoard,  # Liste tabanlı (referans) motor
+    "bitboard": BitboardSOSBoard,  # Bit maskeli hızlı motor
+}
+
+
+def shifted_cells(boards, dr, dc, k):
+    """(dr, dc) yönündeki tüm üçlülerin k. hücrelerini aynı konuma hizalayan dilim"""
+    size = boards.shape[1]
+    r0, r1 = max(0, -2 * dr), size - max(0, 2 * dr)  # Üçlünün başlayabileceği satırlar
+    c0, c1 = max(0, -2 * dc), size - max(0, 2 * dc)  # Üçlünün başlayabileceği sütunlar
+    return boards[:, r0 + k * dr:r1 + k * dr, c0 + k * dc:c1 + k * dc]
+
+
+def resolve_n_jobs(n_jobs):
+    """scikit-learn tarzı n_jobs değerini (None: 1, -1: tüm çekirdekler) işçi sayısına çevirir"""
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, cpu_count + 1 + n_jobs)  # -1 tüm çekirdekler, -2 biri hariç...
+    return max(1, n_jobs)
+
+
 class AITrainer:
-    def __init__(self):
+    def __init__(self, n_jobs=None, canonical=False):
+        # Eğitimde kullanılacak çekirdek sayısı (scikit-learn n_jobs biçiminden bir kez çevrilir;
+        # arayüzden gelen 0 gibi değerler scikit-learn'e ulaşmadan 1'e yuvarlanır)
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.canonical = canonical  # Konumlar simetriye göre kanonik biçime indirgensin mi?
         self.dt_model = DecisionTreeClassifier(max_depth=10)  # Karar ağacı modeli
-        self.rf_model = RandomForestClassifier(n_estimators=100, max_depth=10)  # Rastgele orman modeli
+        self.rf_model = RandomForestClassifier(n_estimators=100, max_depth=10,
+                                               n_jobs=self.n_jobs)  # Rastgele orman modeli (ağaçlar paralel)
         self.training_data = []  # Eğitim verilerini tutmak için boş liste
 
     # Özellik çıkarımı yapan sınıf içindeki fonksiyonlar
@@ -313,152 +334,452 @@ class AITrainer:
         """SOS oluşturma potansiyellerini sayar"""
         potentials = [0, 0]  # SOS oluşturma potansiyelleri listesi (S-O-? ve ?-O-S gibi)
 
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # Sağ, aşağı, sağ çapraz, sol çapraz yönler
+        lines = get_sos_lines(size)  # Her hücrenin ait olduğu SOS üçlüleri
 
         for i in range(size):  # Satırlar üzerinde dön
             for j in range(size):  # Sütunlar üzerinde dön
-                if board_state[i][j] == "S":  # Hücrede "S" varsa
-                    for dr, dc in directions:  # Her yön için
+                cell = board_state[i][j]
+                if cell == " ":
+                    continue  # Boş hücreler potansiyel başlatmaz
+
+                for role, r1, c1, r2, c2, _ in lines[i][j]:
+                    first = board_state[r1][c1]
+                    second = board_state[r2][c2]
+
+                    if cell == "S" and role == SOS_START:  # S üçlünün başındaysa
                         # S-O-? deseni kontrolü
-                        if (0 <= i + 2 * dr < size and 0 <= j + 2 * dc < size and
-                                board_state[i + dr][j + dc] == "O" and
-                                board_state[i + 2 * dr][j + 2 * dc] == " "):
+                        if first == "O" and second == " ":
                             potentials[0] += 1  # Potansiyel sayısını artır
 
-                        # ?-O-S deseni kontrolü
-                        if (0 <= i + 2 * dr < size and 0 <= j + 2 * dc < size and
-                                board_state[i + dr][j + dc] == " " and
-                                board_state[i + 2 * dr][j + 2 * dc] == "S"):
+                        # S-?-S deseni kontrolü
+                        if first == " " and second == "S":
                             potentials[0] += 1  # Potansiyel sayısını artır
 
-                elif board_state[i][j] == "O":  # Hücrede "O" varsa
-                    for dr, dc in directions:  # Her yön için
-                        # S-O-? deseni için: O ortadaysa
-                        if (0 <= i - dr < size and 0 <= j - dc < size and
-                                0 <= i + dr < size and 0 <= j + dc < size and
-                                board_state[i - dr][j - dc] == "S" and
-                                board_state[i + dr][j + dc] == " "):
+                    elif cell == "O" and role == SOS_MIDDLE:  # O üçlünün ortasındaysa
+                        # S-O-? deseni
+                        if first == "S" and second == " ":
                             potentials[0] += 1  # Potansiyel sayısını artır
 
-                        # ?-O-S deseni için
-                        if (0 <= i - dr < size and 0 <= j - dc < size and
-                                0 <= i + dr < size and 0 <= j + dc < size and
-                                board_state[i - dr][j - dc] == " " and
-                                board_state[i + dr][j + dc] == "S"):
+                        # ?-O-S deseni
+                        if first == " " and second == "S":
                             potentials[0] += 1  # Potansiyel sayısını artır
 
         return potentials  # Potansiyel listesini döndür
 
-    def prepare_training_data(self, games_history, board_size):
-        """Oyun geçmişinden eğitim verileri hazırlar"""
-        X = []  # Özellikler için liste
-        y = []  # Etiketler (hamleler) için liste
+    def extract_features_batch(self, boards):
+        """(N, size, size) int8 tahta dizisinden (N, size*size + 5) özellik matrisini çıkarır
 
-        for game in games_history:  # Her oyun için
-            for move in game:  # Her hamle için
-                features = self.extract_features(move["board_state"], board_size)  # Özellik çıkar
-                target = f"{move['row']},{move['col']},{move['letter']}"  # Hedef etiket formatı
+        Hücre değerleri 0 boş, 1 'S', 2 'O' olmalıdır. Sonuç her tahta için
+        extract_features ile birebir aynıdır.
+        """
+        boards = np.asarray(boards, dtype=np.int8)
+        num_boards, size = boards.shape[0], boards.shape[1]
+
+        features = np.empty((num_boards, size * size + 5), dtype=np.int16)
+        features[:, :size * size] = boards.reshape(num_boards, size * size)  # Hücre değerleri
 
-                weight = 1  # Ağırlık değeri
-                if move.get("formed_sos", False):  # Eğer SOS oluşturduysa
-                    weight = 3  # Ağırlığı artır
+        features[:, size * size] = (boards == 1).sum(axis=(1, 2))  # "S" harfi sayısı
+        features[:, size * size + 1] = (boards == 2).sum(axis=(1, 2))  # "O" harfi sayısı
+        features[:, size * size + 2] = (boards == 0).sum(axis=(1, 2))  # Boş hücre sayısı
 
-                for _ in range(weight):  # Ağırlık kadar tekrar ekle
-                    X.append(features)  # Özellikleri listeye ekle
-                    y.append(target)  # Hedefi listeye ekle
+        features[:, size * size + 3] = self.count_sos_potentials_batch(boards)
+        features[:, size * size + 4] = 0  # İkinci potansiyel sayacı (şu an kullanılmıyor)
 
-        self.training_data = (X, y)  # Eğitim verisini sınıf değişkenine kaydet
-        return X, y  # Özellik ve hedefleri döndür
+        return features
 
-    def train_models(self, X, y):
-        """Her iki modeli de eğit"""
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)  # Veriyi böl
+    def count_sos_potentials_batch(self, boards):
+        """count_sos_potentials'ın ilk sayacını tüm tahtalar için kaydırılmış dizilerle hesaplar"""
+        potentials = np.zeros(boards.shape[0], dtype=np.int32)
+
+        for dr, dc in DIRECTIONS:
+            # Üçlünün baş, orta ve son hücrelerini aynı konuma hizalayan dilimler
+            a, b, c = (shifted_cells(boards, dr, dc, k) for k in range(3))
+
+            a_s, c_s = a == 1, c == 1
+            b_o = b == 2
+            a_e, b_e, c_e = a == 0, b == 0, c == 0
+
+            # S başta: S-O-boş ve S-boş-S; O ortada: S-O-boş ve boş-O-S
+            counts = 2 * (a_s & b_o & c_e) + (a_s & b_e & c_s) + (a_e & b_o & c_s)
+            potentials += counts.sum(axis=(1, 2))
+
+        return potentials
+
+    def prepare_training_data(self, games_history, board_size):
+        """Oyun geçmişinden eğitim verileri hazırlar
+
+        Her konum bir kez yer alır; SOS oluşturan hamlelerin önemi satır tekrarı yerine
+        sample_weight vektörüyle (X, y, sample_weight) verilir.
+
+        canonical açıksa her tahta 8 simetrisinin kanonik temsilcisine, hamle etiketi de aynı
+        dönüşümle eşlenir ve aynı (tahta, hamle) örnekleri ağırlıkları toplanarak birleştirilir.
+        """
+        boards = []  # Her oyunun hamle sonrası tahtaları
+        codes = []  # Her oyunun hamle kodları
+
+        for game in games_history:  # Her oyun için
+            if not isinstance(game, GameRecord):
+                game = GameRecord.from_moves(game, board_size)  # Eski biçimdeki hamle listesi
+            if len(game):
+                boards.append(game.positions_array())  # Tahtaları tek geçişte kur
+                codes.append(game.codes_array())
+
+        if not codes:
+            X = np.empty((0, board_size * board_size + 5), dtype=np.int16)
+            y = np.empty(0, dtype=str)
+            sample_weight = np.empty(0)
+            self.training_data = (X, y, sample_weight)
+            return X, y, sample_weight
+
+        boards = np.concatenate(boards)
+        codes = np.concatenate(codes)
+
+        move_ids = codes >> 1  # Hamle numarası: hücre * 2 + harf kodu
+        sample_weight = np.where(codes & 1, 3.0, 1.0)  # SOS oluşturan hamlelerin ağırlığı 3
+
+        if self.canonical:
+            # Tahtayı kanonik simetrisine çevir, hamle hücresini aynı dönüşümle eşle
+            boards, transforms = canonicalize_boards(boards)
+            move_ids = canonical_cells(move_ids >> 1, transforms, board_size) * 2 + (move_ids & 1)
+            boards, move_ids, sample_weight = self.fold_samples(boards, move_ids, sample_weight)
+
+        features = self.extract_features_batch(boards)  # Özellikleri toplu çıkar
+
+        # Hedef etiketler "satır,sütun,harf" biçiminde (hücre * 2 + harf koduna göre tablo)
+        labels = np.array([f"{cell // board_size},{cell % board_size},{letter}"
+                           for cell in range(board_size * board_size) for letter in ('S', 'O')])
+        targets = labels[move_ids]
+
+        self.training_data = (features, targets, sample_weight)  # Eğitim verisini sınıf değişkenine kaydet
+        return features, targets, sample_weight  # Özellikler, hedefler ve örnek ağırlıkları
+
+    def fold_samples(self, rows, labels, sample_weight):
+        """Aynı (satır, etiket) örneklerini tek örnekte birleştirir, ağırlıkları toplar
+
+        rows (N, ...) tamsayı dizisi, labels (N,) tamsayı ya da metin dizisidir.
+        """
+        _, label_ids = np.unique(labels, return_inverse=True)
+        keys = np.column_stack([rows.reshape(len(rows), -1).astype(np.int32), label_ids])
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+
+        weights = np.bincount(inverse.ravel(), weights=sample_weight, minlength=len(first))
+        return rows[first], labels[first], weights
+
+    def train_models(self, X, y, sample_weight=None):
+        """Her iki modeli de eğit (sample_weight verilirse eğitimde örnek ağırlığı olarak kullanılır)"""
+        if sample_weight is None:
+            sample_weight = np.ones(len(y))  # Ağırlık verilmediyse tüm örnekler eşit
+
+        # Veriyi böl (her konum tek satır olduğundan test kümesine kopya sızmaz)
+        X_train, X_test, y_train, y_test, w_train, _ = train_test_split(
+            X, y, sample_weight, test_size=0.2, random_state=42)
+
+        # Decision Tree ayrı bir iş parçacığında, Random Forest ile aynı anda eğitilir
+        # (ağaç kurma kodu GIL'i bıraktığı için iki eğitim gerçekten eşzamanlı ilerler)
+        dt_errors = []
+
+        def fit_decision_tree():
+            try:
+                self.dt_model.fit(X_train, y_train, sample_weight=w_train)  # Decision Tree modeli eğit
+            except Exception as e:
+                dt_errors.append(e)
 
         print("Decision Tree modeli eğitiliyor...")  # Bilgi mesajı
-        self.dt_model.fit(X_train, y_train)  # Decision Tree modeli eğit
-        dt_score = self.dt_model.score(X_test, y_test)  # Başarı oranını al
+        dt_thread = threading.Thread(target=fit_decision_tree, daemon=True)
+        dt_thread.start()
+
+        print(f"Random Forest modeli eğitiliyor ({self.n_jobs} çekirdek)...")  # Bilgi mesajı
+        self.rf_model.fit(X_train, y_train, sample_weight=w_train)  # Random Forest modeli eğit
+
+        dt_thread.join()  # Decision Tree eğitiminin bitmesini bekle
+        if dt_errors:
+            raise dt_errors[0]
 
-        print("Random Forest modeli eğitiliyor...")  # Bilgi mesajı
-        self.rf_model.fit(X_train, y_train)  # Random Forest modeli eğit
+        dt_score = self.dt_model.score(X_test, y_test)  # Başarı oranını al
         rf_score = self.rf_model.score(X_test, y_test)  # Başarı oranını al
 
         return {"dt_score": dt_score, "rf_score": rf_score}  # Başarı oranlarını döndür
 
-    def save_models(self, board_size):
-        """Modelleri kaydet"""
-        os.makedirs("models", exist_ok=True)  # Klasör yoksa oluştur
+    def save_models(self, board_size, scores=None):
+        """Modelleri kaydet (scores: train_models'in döndürdüğü başarı oranları, indekse yazılır)
+
+        Her model sıkıştırılmış pickle ve düz model olarak atomik yazılır; aynı tip ve boyuttaki
+        eski modeller kayıt defterinin saklama politikasına göre silinir.
+        """
+        scores = scores or {}
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # Zaman etiketi oluştur
+        # Oyunda tek örnekli tahmin yapılır; kaydedilen ormanda paralel tahmini kapat
+        self.rf_model.n_jobs = None
 
-        dt_filename = f"models/sos_dt_{board_size}x{board_size}_{timestamp}.pkl"  # DT model dosya adı
-        with open(dt_filename, 'wb') as f:  # Dosyayı yazma modunda aç
-            pickle.dump(self.dt_model, f)  # Modeli dosyaya yaz
+        # Kanonik tahtalarla eğitilen modeller oyunda da kanonik tahtayla sorgulanmalı
+        for model in (self.dt_model, self.rf_model):
+            model.canonical_symmetry = self.canonical
 
-        rf_filename = f"models/sos_rf_{board_size}x{board_size}_{timestamp}.pkl"  # RF model dosya adı
-        with open(rf_filename, 'wb') as f:  # Dosyayı yazma modunda aç
-            pickle.dump(self.rf_model, f)  # Modeli dosyaya yaz
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # Zaman etiketi oluştur (iki model için aynı)
 
-        return {"dt_model": dt_filename, "rf_model": rf_filename}  # Dosya yollarını döndür
+        registry = ModelRegistry("models")
+        model_paths = {}
+        for ai_type, model in (("dt", self.dt_model), ("rf", self.rf_model)):
+            entry = registry.register(ai_type, board_size, model, scores.get(f"{ai_type}_score"), timestamp)
+            model_paths[f"{ai_type}_model"] = os.path.join(registry.models_dir, entry["file"])
+
+        return model_paths  # Dosya yollarını döndür
+
+
+# Tek bir kendi kendine oyunu oynatan fonksiyon
+def play_self_play_game(board_class, board_size, player1_diff, player2_diff):
+    """Kural bazlı iki bot arasında bir oyun oynatır ve oyunun hamle kaydını döndürür"""
+    game = board_class(size=board_size)  # Yeni oyun oluştur
+    #kural bazlı botlar oynuyor
+    while not game.game_over:  # Oyun bitene kadar
+        if game.current_player == 1:  # Sıra oyuncu 1'deyse
+            move = game.rule_based_move(player1_diff)  # Oyuncu 1 için hamle üret
+        else:
+            move = game.rule_based_move(player2_diff)  # Oyuncu 2 için hamle üret
+
+        if move:  # Eğer geçerli hamle varsa
+            row, col, letter = move  # Hamleyi ayır
+            game.make_move(row, col, letter)  # Hamleyi uygula
+        else:
+            break  # Hamle yoksa döngüden çık
+
+    return game.moves_history
+
+
+def _play_games_chunk(task):
+    """Bir grup oyunu kendi tohumuyla oynatır (süreç havuzundaki işçilerde çalışır)"""
+    chunk_idx, chunk_games, seed, board_size, player1_diff, player2_diff, engine = task
+    if engine == "vector":
+        # Grubun tüm oyunları tek bir NumPy ortamında kilit adımlı oynanır
+        env = VectorSOSEnv(chunk_games, board_size, seed=seed)
+        return chunk_idx, env.play(player1_diff, player2_diff)
+
+    random.seed(seed)  # Her grup kendi tohumuyla tekrarlanabilir
+    board_class = ENGINES[engine]
+    games = [play_self_play_game(board_class, board_size, player1_diff, player2_diff)
+             for _ in range(chunk_games)]
+    return chunk_idx, games
+
+
+# Kendi kendine oyun gruplarını bittikçe veren üreteç
+def iter_self_play_chunks(board_size=5, num_games=10000, player1_diff="hard", player2_diff="hard",
+                          engine="bitboard", n_workers=None, chunk_size=100, seed=None):
+    """Oyunları gruplar halinde oynatır ve her grubu bittiği anda (grup no, oyunlar) olarak verir
+
+    engine ENGINES'teki bir tahta motoru ya da "vector" olabilir; "vector" bir grubun tüm
+    oyunlarını tek NumPy ortamında oynar (büyük chunk_size ile en hızlısıdır).
+
+    Oyunlar chunk_size'lık gruplar halinde n_workers süreçlik bir havuza dağıtılır
+    (None: tüm çekirdekler, 1: aynı süreçte). Her grup seed + grup numarası ile
+    tohumlandığından aynı seed ile işçi sayısından bağımsız olarak aynı oyunlar üretilir.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 31)  # Tohum verilmediyse rastgele bir taban seç
+
+    # Oyunları gruplara böl: (grup no, oyun sayısı, tohum, ...) görevleri
+    tasks = []
+    for chunk_idx, start in enumerate(range(0, num_games, chunk_size)):
+        chunk_games = min(chunk_size, num_games - start)
+        tasks.append((chunk_idx, chunk_games, seed + chunk_idx, board_size,
+                      player1_diff, player2_diff, engine))
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1  # Varsayılan: tüm çekirdekler
+    n_workers = max(1, min(n_workers, len(tasks)))
+
+    if n_workers == 1:
+        yield from map(_play_games_chunk, tasks)  # Aynı süreçte sırayla oyna
+        return
+
+    print(f"{n_workers} süreç ile paralel oynatılıyor...")  # Bilgi mesajı
+    pool = multiprocessing.Pool(processes=n_workers)
+    try:
+        yield from pool.imap_unordered(_play_games_chunk, tasks)  # Biten grup hemen gelir
+    except GeneratorExit:
+        pool.terminate()  # Üreteç erken kapatıldı: kalan grupları oynatma
+        raise
+    finally:
+        pool.close()
+        pool.join()
+
+
+def print_game_totals(num_games, total_moves):
+    """Oyun üretimi sonunda toplam ve ortalama hamle bilgisini yazdırır"""
+    print(f"{num_games} oyun tamamlandı!")  # Tamamlama bildirimi
+
+    avg_moves = total_moves / num_games  # Ortalama hamle sayısı
+
+    print(f"Toplam hamle: {total_moves}")  # Toplam hamle bilgisi
+    print(f"Ortalama hamle/oyun: {avg_moves:.2f}")  # Ortalama bilgi
 
 
 # Eğitim verisi oluşturan fonksiyon
-def generate_training_data(board_size=5, num_games=10000, player1_diff="hard", player2_diff="hard"):
-    """Eğitim verisi oluştur"""
+def generate_training_data(board_size=5, num_games=10000, player1_diff="hard", player2_diff="hard",
+                           engine="bitboard", n_workers=None, chunk_size=100, seed=None):
+    """Eğitim verisi oluştur (tüm oyunlar bellekte, grup sırasıyla döndürülür)"""
     print(f"{board_size}x{board_size} tahta için {num_games} oyun oluşturuluyor...")  # Bilgi mesajı
     print(f"Oyuncu 1: {player1_diff} zorluk | Oyuncu 2: {player2_diff} zorluk")  # Oyuncu bilgisi
 
-    games_history = []  # Oyun geçmişini tutacak liste
+    chunks = {}  # Grupların sonuçları (grup no -> oyunlar)
+    completed = 0  # Tamamlanan oyun sayısı
 
-    for game_idx in range(num_games):  # Belirtilen sayıda oyun döngüsü
-        if (game_idx + 1) % 100 == 0:  # Her 100 oyunda bir durum bildirimi
-            print(f"Oyun {game_idx + 1}/{num_games} tamamlandı")
+    for chunk_idx, games in iter_self_play_chunks(board_size, num_games, player1_diff, player2_diff,
+                                                  engine, n_workers, chunk_size, seed):
+        chunks[chunk_idx] = games  # Gruplar bittikçe birleştir
+        completed += len(games)
+        print(f"Oyun {completed}/{num_games} tamamlandı")  # Durum bildirimi
 
-        game = SOSBoard(size=board_size)  # Yeni oyun oluştur
-        #kural bazlı botlar oynuyor
-        while not game.game_over:  # Oyun bitene kadar
-            if game.current_player == 1:  # Sıra oyuncu 1'deyse
-                move = game.rule_based_move(player1_diff)  # Oyuncu 1 için hamle üret
-            else:
-                move = game.rule_based_move(player2_diff)  # Oyuncu 2 için hamle üret
+    # Oyun geçmişini grup sırasıyla birleştir
+    games_history = [game for chunk_idx in sorted(chunks) for game in chunks[chunk_idx]]
 
-            if move:  # Eğer geçerli hamle varsa
-                row, col, letter = move  # Hamleyi ayır
-                game.make_move(row, col, letter)  # Hamleyi uygula
-            else:
-                break  # Hamle yoksa döngüden çık
+    print_game_totals(num_games, sum(len(game) for game in games_history))
 
-        games_history.append(game.moves_history)  # Oyunu geçmişe ekle
+    return games_history  # Oyun geçmişini döndür
 
-    print(f"{num_games} oyun tamamlandı!")  # Tamamlama bildirimi
 
-    total_moves = sum(len(game) for game in games_history)  # Toplam hamle sayısı
-    avg_moves = total_moves / num_games  # Ortalama hamle sayısı
+# Kendi kendine oyunları diskteki parçalara yazan fonksiyon
+def generate_training_shards(shard_dir, board_size=5, num_games=10000, player1_diff="hard",
+                             player2_diff="hard", games_per_shard=1000, engine="bitboard", n_workers=None,
+                             seed=None, on_shard=None, stop_event=None):
+    """Oyunları bellekte biriktirmeden sabit boyutlu parçalara yazar
 
-    print(f"Toplam hamle: {total_moves}")  # Toplam hamle bilgisi
-    print(f"Ortalama hamle/oyun: {avg_moves:.2f}")  # Ortalama bilgi
+    Her parça yazıldığında yolu on_shard'a verilir; tüm parça yollarını döndürür.
+    stop_event (threading.Event) kurulursa üretim bir sonraki grupta kesilir, kalan oyunlar
+    oynatılmaz ve yarım parça yazılmaz.
+    """
+    print(f"{board_size}x{board_size} tahta için {num_games} oyun parçalara yazılıyor...")  # Bilgi mesajı
+    print(f"Oyuncu 1: {player1_diff} zorluk | Oyuncu 2: {player2_diff} zorluk")  # Oyuncu bilgisi
 
-    return games_history  # Oyun geçmişini döndür
+    writer = ShardWriter(shard_dir, board_size, games_per_shard)
+    completed = 0  # Tamamlanan oyun sayısı
+    total_moves = 0  # Toplam hamle sayısı
+
+    chunks = iter_self_play_chunks(board_size, num_games, player1_diff, player2_diff,
+                                   engine, n_workers, seed=seed)
+    try:
+        for _, games in chunks:
+            if stop_event is not None and stop_event.is_set():
+                return writer.paths  # Tüketici durdu: süreç havuzu kapatılır
+            for record in games:
+                total_moves += len(record)
+                path = writer.add(record)  # Parça dolduysa diske yazılır
+                if path and on_shard:
+                    on_shard(path)
+            completed += len(games)
+            print(f"Oyun {completed}/{num_games} tamamlandı")  # Durum bildirimi
+    finally:
+        chunks.close()  # Erken çıkışta kalan oyun gruplarını iptal et
+
+    last_paths = len(writer.paths)
+    paths = writer.close()  # Kalan oyunları son parçaya yaz
+    if on_shard:
+        for path in paths[last_paths:]:
+            on_shard(path)
+
+    print_game_totals(num_games, total_moves)
+
+    return paths
+
+
+# Parçaları üretimle eşzamanlı olarak özelliklere dönüştüren fonksiyon
+def stream_training_data(trainer, shard_dir, board_size=5, num_games=10000, games_per_shard=1000,
+                         engine="bitboard", n_workers=None, seed=None):
+    """Oyunları arka planda parçalara yazar, biten her parçayı hemen özelliklere çevirir
+
+    Bellekte oyun geçmişi tutulmaz; her parçanın özellikleri küçük NumPy dizilerine
+    dönüştürülür. (X, y, sample_weight) döndürür. Özellik çıkarımı hata verirse üretici
+    durdurulur ve beklenir; parça klasörü silinirken arka planda yazma sürmez.
+    """
+    shard_queue = queue.Queue()  # Yazılan parçaların yolları (bitince None)
+    errors = []  # Üretici iş parçacığındaki hata
+    stop_event = threading.Event()  # Tüketici erken çıkarsa üreticiyi durdurur
+
+    def producer():
+        try:
+            generate_training_shards(shard_dir, board_size, num_games, games_per_shard=games_per_shard,
+                                     engine=engine, n_workers=n_workers, seed=seed,
+                                     on_shard=shard_queue.put, stop_event=stop_event)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            shard_queue.put(None)  # Üretim bitti
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+
+    X_parts = []  # Parça başına özellik dizileri
+    y_parts = []  # Parça başına etiket dizileri
+    w_parts = []  # Parça başına örnek ağırlıkları
+
+    try:
+        while True:
+            path = shard_queue.get()
+            if path is None:
+                break
+
+            # Parça bellek eşlemeyle okunur ve hemen özelliklere çevrilir
+            X_shard, y_shard, w_shard = trainer.prepare_training_data(iter_shard_games(path), board_size)
+            X_parts.append(X_shard)
+            y_parts.append(y_shard)
+            w_parts.append(w_shard)
+    finally:
+        stop_event.set()  # Normal bitişte etkisiz; hata olduysa üretimi kes
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    X = np.concatenate(X_parts) if X_parts else np.empty((0, board_size * board_size + 5), dtype=np.int16)
+    y = np.concatenate(y_parts) if y_parts else np.empty(0, dtype=str)
+    sample_weight = np.concatenate(w_parts) if w_parts else np.empty(0)
+    if trainer.canonical and len(X):
+        X, y, sample_weight = trainer.fold_samples(X, y, sample_weight)  # Parçalar arası tekrarlar
+    trainer.training_data = (X, y, sample_weight)  # Eğitim verisini sınıf değişkenine kaydet
+    return X, y, sample_weight
 
 
 # Model eğitimi ve kaydetme fonksiyonu
-def train_and_save_models(board_size=5, num_games=10000):
-    """Veri oluştur, eğit ve modelleri kaydet"""
+def train_and_save_models(board_size=5, num_games=10000, n_workers=None, shard_dir=None, n_jobs=-1,
+                          canonical=False):
+    """Veri oluştur, eğit ve modelleri kaydet
+
+    Oyunlar shard_dir altındaki parçalara yazılır (verilmezse geçici bir klasör kullanılır
+    ve eğitimden sonra silinir); özellik çıkarımı parçalar yazıldıkça yapılır.
+    n_jobs (scikit-learn biçimi, -1: tüm çekirdekler) model eğitiminde ve n_workers
+    verilmediyse kendi kendine oyunda kullanılan çekirdek sayısını belirler.
+    canonical açıksa konumlar simetriye göre birleştirilir; modeller kanonik tahtalarla
+    tahmin yapılması gerektiğini belirten canonical_symmetry özelliğiyle kaydedilir.
+    Varsayılan olarak kapalıdır: zor-zor kendi kendine oyun belirlenimci olduğundan oyunlar
+    birleştirilince tek oyunluk örneğe iner ve model dejenere olur.
+    """
+    if n_workers is None:
+        n_workers = resolve_n_jobs(n_jobs)  # Kendi kendine oyun da aynı çekirdek ayarını kullanır
+
     print("Eğitim verisi oluşturuluyor...")  # Bilgi mesajı
-    games_history = generate_training_data(board_size, num_games)  # Eğitim verisi üret
+    trainer = AITrainer(n_jobs=n_jobs, canonical=canonical)  # Eğitici sınıfı örnekle
+
+    temp_dir = None
+    if shard_dir is None:
+        shard_dir = temp_dir = tempfile.mkdtemp(prefix="sos_shards_")  # Geçici parça klasörü
+
+    try:
+        X, y, sample_weight = stream_training_data(trainer, shard_dir, board_size, num_games,
+                                                   n_workers=n_workers)  # Eğitim verisini üret ve hazırla
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)  # Geçici parçaları sil
 
     print("Modeller eğitiliyor...")  # Bilgi mesajı
-    trainer = AITrainer()  # Eğitici sınıfı örnekle
-    X, y = trainer.prepare_training_data(games_history, board_size)  # Eğitim verisini hazırla
 
     print(f"Toplam {len(X)} örnek ile eğitim yapılıyor")  # Eğitim verisi sayısı
-    scores = trainer.train_models(X, y)  # Modelleri eğit
+    scores = trainer.train_models(X, y, sample_weight)  # Modelleri eğit
 
     print(f"Eğitim tamamlandı!")  # Eğitim tamamlandı bildirimi
     print(f"Decision Tree doğruluk: {scores['dt_score']:.4f}")  # DT doğruluk oranı
     print(f"Random Forest doğruluk: {scores['rf_score']:.4f}")  # RF doğruluk oranı
 
     print("Modeller kaydediliyor...")  # Kayıt bildirimi
-    model_paths = trainer.save_models(board_size)  # Modelleri kaydet
+    model_paths = trainer.save_models(board_size, scores)  # Modelleri kaydet
 
     print("Modeller başarıyla kaydedildi!")  # Kayıt başarılı bildirimi
     print(f"Decision Tree modeli: {model_paths['dt_model']}")  # DT model dosya yolu
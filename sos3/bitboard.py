@@ -0,0 +1,328 @@
+import random  # Rastgele sayı ve seçim işlemleri için
+from sos_lines import get_sos_lines, DIRECTIONS, SOS_START, SOS_MIDDLE  # SOS üçlü tabloları
+from game_record import GameRecord  # Sıkıştırılmış oyun kaydı
+from zobrist import get_hasher  # Konumların Zobrist anahtarları
+from tablebase import get_tablebase  # Az boş hücreli konumların kesin değerleri
+from opening_book import get_opening_book  # Açılış konumları için önceden hesaplanmış hamleler
+
+
+# Tahta boyutuna göre önceden hesaplanmış maskeleri tutan önbellek
+_MASK_CACHE = {}
+
+
+def get_line_masks(size):
+    """Verilen tahta boyutu için SOS çizgi maskelerini (bir kez) hesaplar ve döndürür"""
+    if size in _MASK_CACHE:
+        return _MASK_CACHE[size]
+
+    total_cells = size * size
+    lines = get_sos_lines(size)  # Her hücrenin ait olduğu SOS üçlüleri
+
+    # Her hücre için: bu hücre SOS'un ucundaysa (orta O biti, diğer uç S biti) çiftleri
+    s_end = [[] for _ in range(total_cells)]
+    # Her hücre için: bu hücre SOS'un ortasındaysa (iki S bitinin birleşik maskesi)
+    o_mid = [[] for _ in range(total_cells)]
+    # Her yön için üçlünün başlayabileceği hücrelerin maskesi
+    start_masks = {(dr, dc): 0 for dr, dc in DIRECTIONS}
+
+    for r in range(size):
+        for c in range(size):
+            cell = r * size + c
+            for role, r1, c1, r2, c2, (_, _, dr, dc) in lines[r][c]:
+                first = 1 << (r1 * size + c1)
+                second = 1 << (r2 * size + c2)
+                if role == SOS_MIDDLE:
+                    o_mid[cell].append(first | second)
+                else:
+                    s_end[cell].append((first, second))
+                    if role == SOS_START:
+                        start_masks[(dr, dc)] |= 1 << cell
+
+    # Kelime düzeyinde tehdit hesabı için yön başına (kaydırma, başlangıç maskesi) listesi
+    shifts = [(dr * size + dc, start_masks[(dr, dc)]) for dr, dc in DIRECTIONS]
+
+    masks = {
+        "full": (1 << total_cells) - 1,  # Tüm hücreler
+        "s_end": s_end,
+        "o_mid": o_mid,
+        "shifts": shifts,
+    }
+    _MASK_CACHE[size] = masks
+    return masks
+
+
+def threat_masks(s_bits, o_bits, empty, shifts):
+    """Şu an SOS tamamlayan boş hücreleri ('S' için, 'O' için) iki bit maskesi olarak döndürür"""
+    s_threats = 0
+    o_threats = 0
+
+    for step, start_mask in shifts:
+        # Hücre üçlünün başı: sağında O, iki sağında S
+        s_threats |= (o_bits >> step) & (s_bits >> (2 * step)) & start_mask
+        # Hücre üçlünün sonu: solunda O, iki solunda S
+        s_threats |= (o_bits << step) & (s_bits << (2 * step)) & (start_mask << (2 * step))
+        # Hücre üçlünün ortası: iki yanında S
+        o_threats |= (s_bits >> step) & (s_bits << step) & (start_mask << step)
+
+    return s_threats & empty, o_threats & empty
+
+
+# S ve O doluluğunu iki tamsayı bit maskesinde tutan SOS tahtası
+class BitboardSOSBoard:
+    def __init__(self, size=5):
+        self.size = size  # Oyun tahtasının boyutu
+
+        # Bu boyut için önceden hesaplanmış çizgi maskeleri
+        self.masks = get_line_masks(size)
+
+        # 'S' ve 'O' harflerinin bulunduğu hücrelerin bit maskeleri
+        self.s_bits = 0
+        self.o_bits = 0
+
+        self.current_player = 1  # Oyuncu bilgisi (1. oyuncu ile başlanır)
+        self.scores = {1: 0, 2: 0}  # Oyuncuların skorları
+        self.filled_cells = 0  # Doldurulmuş hücre sayısı
+        self.total_cells = size * size  # Toplam hücre sayısı
+        self.game_over = False  # Oyun bitmiş mi?
+        self.moves_history = GameRecord(size)  # Sıkıştırılmış hamle geçmişi (AI eğitimi için)
+        self.undo_stack = []  # Geri alma yığını: (bit, harf, oyuncu, skor farkı) kayıtları
+        self.hasher = get_hasher(size)  # Zobrist anahtarları
+        self.board_key = 0  # Tahtanın Zobrist anahtarı (her hamlede tek XOR ile güncellenir)
+
+    @classmethod
+    def from_position(cls, board, current_player=1, scores=None):
+        """Tahta listesi, sıradaki oyuncu ve skorlardan oyun oluşturur (hamle geçmişi boş başlar)"""
+        game = cls(size=len(board))
+        for i, row in enumerate(board):
+            for j, letter in enumerate(row):
+                if letter == ' ':
+                    continue
+                bit = 1 << (i * game.size + j)
+                if letter == 'S':
+                    game.s_bits |= bit
+                else:
+                    game.o_bits |= bit
+                game.board_key ^= game.hasher.move_key(i, j, letter)
+                game.filled_cells += 1
+
+        game.current_player = current_player
+        if scores is not None:
+            game.scores = dict(scores)
+        game.game_over = game.filled_cells == game.total_cells
+        return game
+
+    @property
+    def board(self):
+        """Bit maskelerinden SOSBoard ile aynı biçimde 2 boyutlu tahta listesi üretir"""
+        board = []
+        for i in range(self.size):
+            row = []
+            for j in range(self.size):
+                bit = 1 << (i * self.size + j)
+                if self.s_bits & bit:
+                    row.append('S')
+                elif self.o_bits & bit:
+                    row.append('O')
+                else:
+                    row.append(' ')
+            board.append(row)
+        return board
+
+    def empty_bits(self):
+        """Boş hücrelerin bit maskesini döndürür"""
+        return self.masks["full"] & ~(self.s_bits | self.o_bits)
+
+    def make_move(self, row, col, letter):
+        """Verilen hücreye (row, col) 'S' veya 'O' harfini koyarak bir hamle yapar"""
+        if row < 0 or row >= self.size or col < 0 or col >= self.size:
+            return False
+
+        bit = 1 << (row * self.size + col)
+        if (self.s_bits | self.o_bits) & bit:
+            return False  # Hücre zaten dolu
+
+        if letter == 'S':
+            self.s_bits |= bit
+        else:
+            self.o_bits |= bit
+        self.board_key ^= self.hasher.move_key(row, col, letter)
+
+        self.filled_cells += 1
+
+        sos_formed = self.check_sos(row, col)
+        self.moves_history.append(row, col, letter, sos_formed)
+        self.undo_stack.append((bit, letter, self.current_player, 1 if sos_formed else 0))
+
+        if sos_formed:
+            self.scores[self.current_player] += 1
+        else:
+            self.current_player = 3 - self.current_player
+
+        if self.filled_cells == self.total_cells:
+            self.game_over = True
+
+        return True
+
+    def unmake_move(self):
+        """Son hamleyi geri alır ve (row, col, letter) döndürür; geri alınacak hamle yoksa None"""
+        if not self.undo_stack:
+            return None
+
+        bit, letter, player, score_delta = self.undo_stack.pop()
+
+        self.s_bits &= ~bit
+        self.o_bits &= ~bit
+        self.filled_cells -= 1
+        self.scores[player] -= score_delta
+        self.current_player = player
+        self.game_over = False
+        self.moves_history.pop()
+
+        row, col = divmod(bit.bit_length() - 1, self.size)
+        self.board_key ^= self.hasher.move_key(row, col, letter)
+        return row, col, letter
+
+    def check_sos(self, row, col):
+        """(row, col) hücresindeki harf ile bir SOS oluşmuş mu kontrol eder"""
+        cell = row * self.size + col
+        bit = 1 << cell
+
+        if self.s_bits & bit:
+            for o_bit, s_bit in self.masks["s_end"][cell]:
+                if self.o_bits & o_bit and self.s_bits & s_bit:
+                    return True
+        elif self.o_bits & bit:
+            for pair in self.masks["o_mid"][cell]:
+                if self.s_bits & pair == pair:
+                    return True
+
+        return False
+
+    def get_winner(self):
+        """Oyun sonunda skorlara göre kazanan oyuncuyu döndürür"""
+        if self.scores[1] > self.scores[2]:
+            return 1
+        elif self.scores[2] > self.scores[1]:
+            return 2
+        else:
+            return 0  # Beraberlik
+
+    def get_possible_moves(self):
+        """Tüm boş hücreler için 'S' ve 'O' hamlelerini SOSBoard ile aynı sırada döndürür"""
+        moves = []
+        empty = self.empty_bits()
+
+        while empty:
+            low = empty & -empty  # En düşük indeksli boş hücre
+            cell = low.bit_length() - 1
+            i, j = divmod(cell, self.size)
+            moves.append((i, j, 'S'))
+            moves.append((i, j, 'O'))
+            empty ^= low
+
+        return moves
+
+    def rule_based_move(self, difficulty="hard"):
+        """Kural bazlı bir hamle yap"""
+        if difficulty == "easy":
+            return self.rule_based_move_easy()
+        elif difficulty == "medium":
+            # %70 zor, %30 kolay
+            if random.random() < 0.7:
+                return self.rule_based_move_hard()
+            else:
+                return self.rule_based_move_easy()
+        else:  # hard
+            return self.rule_based_move_hard()
+
+    def rule_based_move_easy(self):
+        """Kolay seviye için rastgele hamle yap"""
+        possible_moves = self.get_possible_moves()
+
+        if not possible_moves:
+            return None
+
+        return random.choice(possible_moves)
+
+    def rule_based_move_hard(self):
+        """Zor seviye için akıllı hamle yap (SOSBoard ile aynı hamleyi seçer)"""
+        empty = self.empty_bits()
+
+        # 0. Açılıştaysak kitaptaki hamleyi, oyun sonu tablosu varsa kesin en iyi hamleyi oyna
+        book = get_opening_book(self.size)
+        if book is not None and self.filled_cells <= book.max_plies:
+            book_move = book.lookup(self.board)
+            if book_move:
+                return book_move
+
+        tablebase = get_tablebase(self.size)
+        if tablebase is not None and bin(empty).count("1") <= tablebase.max_empty:
+            table_move = tablebase.best_move(self.board)
+            if table_move:
+                return table_move
+
+        s_threats, o_threats = threat_masks(self.s_bits, self.o_bits, empty, self.masks["shifts"])
+
+        # 1-2. SOS yapan (ya da rakibin SOS yapacağı) ilk hücreyi satır sırasıyla seç
+        threats = s_threats | o_threats
+        if threats:
+            low = threats & -threats
+            i, j = divmod(low.bit_length() - 1, self.size)
+            return (i, j, 'S') if s_threats & low else (i, j, 'O')
+
+        # 3. Stratejik hamle: en yüksek (puan, satır, sütun, harf) dörtlüsü
+        best = None
+        while empty:
+            low = empty & -empty
+            i, j = divmod(low.bit_length() - 1, self.size)
+            for letter in ('S', 'O'):
+                score = self.evaluate_strategic_move(i, j, letter, (s_threats, o_threats))
+                candidate = (score, i, j, letter)
+                if best is None or candidate > best:
+                    best = candidate
+            empty ^= low
+
+        if best is not None:
+            return best[1:]
+
+        return self.rule_based_move_easy()
+
+    def evaluate_strategic_move(self, row, col, letter, threats=None):
+        """Stratejik hamle puanını hesapla (SOSBoard.evaluate_strategic_move ile aynı puan)
+
+        threats verilirse (mevcut S ve O tehdit maskeleri) tekrar hesaplanmaz.
+        """
+        score = 0
+        cell = row * self.size + col
+        bit = 1 << cell
+        s_bits, o_bits = self.s_bits, self.o_bits
+        empty = self.empty_bits()
+
+        if threats is None:
+            threats = threat_masks(s_bits, o_bits, empty, self.masks["shifts"])
+        s_threats, o_threats = threats
+
+        if letter == 'S':
+            for o_bit, s_bit in self.masks["s_end"][cell]:
+                if empty & s_bit:
+                    if o_bits & o_bit:
+                        score += 2  # Gerçekleşmeye yakın SOS
+                        s_threats |= s_bit  # Rakip uca S koyarak SOS yapar
+                    elif empty & o_bit:
+                        score += 1  # Potansiyel SOS
+                elif s_bits & s_bit and empty & o_bit:
+                    o_threats |= o_bit  # Rakip ortaya O koyarak SOS yapar
+        else:
+            for pair in self.masks["o_mid"][cell]:
+                found = s_bits & pair
+                if found == pair:
+                    score += 10  # Kesin SOS
+                elif found and empty & pair == pair ^ found:
+                    score += 3  # SOS ihtimali
+                    s_threats |= pair ^ found  # Rakip boş uca S koyarak SOS yapar
+
+        # Rakibin bu hamleden sonra SOS yapabileceği (hücre, harf) çiftleri: mevcut
+        # tehditler (bu hücre hariç) ve yalnızca bu hücrenin üçlülerinde doğan yeni tehditler
+        score -= 5 * ((s_threats & ~bit).bit_count() + (o_threats & ~bit).bit_count())
+
+        return score
@@ -0,0 +1,153 @@
+import sys  # Komut satırı argümanları için
+import pickle  # scikit-learn modellerini okumak için (sadece dönüştürürken)
+import numpy as np  # Düğüm dizileri ve tahmin için
+
+
+# Eğitilmiş karar ağacı / rastgele orman modelinin scikit-learn gerektirmeyen düz hali
+class FlatTreeModel:
+    """Tüm ağaçların düğümleri tek dizilerde art arda durur (ağaç t'nin kökü roots[t]).
+
+    feature, threshold: bölme özelliği ve eşiği (özellik <= eşik ise sola gidilir)
+    left, right: alt düğümlerin dizideki indeksleri; yapraklar kendilerini gösterir, böylece
+    tüm ağaçlar aynı sayıda adımla (en büyük derinlik) yaprağa iner
+    value: her düğümün sınıf olasılıkları (scikit-learn'ün predict_proba'da kullandığı değerler)
+
+    predict / predict_proba scikit-learn modeliyle aynı sonucu verir.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes, max_depth,
+                 canonical_symmetry=False):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes  # Sınıf etiketleri ("satır,sütun,harf")
+        self.max_depth = max_depth  # En derin ağacın derinliği
+        self.canonical_symmetry = canonical_symmetry  # Model kanonik tahtalarla mı eğitildi?
+
+        # Sınıf etiketlerinin hamle hali: classes_[i] == "satır,sütun,harf" -> (satır, sütun, harf)
+        self.class_moves = []
+        for label in classes.tolist():
+            row, col, letter = label.split(",")
+            self.class_moves.append((int(row), int(col), letter))
+
+        # Tek ağaçta tek girdi için NumPy çağrılarından kaçınan liste kopyaları
+        self.node_lists = (feature.tolist(), threshold.tolist(), left.tolist(), right.tolist())
+
+    def apply(self, X):
+        """(N, özellik) girdiler için her ağaçta varılan yaprak: (N, ağaç) düğüm indeksleri"""
+        if len(self.roots) == 1 and len(X) == 1:
+            # Karar ağacında tek konum: düğümleri Python listeleriyle gez (birkaç mikrosaniye)
+            x = X[0]
+            feature, threshold, left, right = self.node_lists
+            node = int(self.roots[0])
+            while left[node] != node:
+                node = left[node] if x[feature[node]] <= threshold[node] else right[node]
+            return np.array([[node]])
+
+        if len(X) == 1:
+            # Ormanda tek konum: tüm ağaçlar tek boyutlu dizilerle birlikte bir seviye iner
+            x = np.asarray(X[0], dtype=np.float64)
+            nodes = self.roots
+            for _ in range(self.max_depth):
+                nodes = np.where(x[self.feature[nodes]] <= self.threshold[nodes], self.left[nodes], self.right[nodes])
+            return nodes[None]
+
+        X = np.asarray(X, dtype=np.float64)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        """Sınıf olasılıkları: ağaçların yaprak olasılıklarının ortalaması"""
+        # Ağaçlar sırayla toplanır (scikit-learn ile aynı toplama sırası, aynı kayan nokta sonucu)
+        proba = self.value[self.apply(X)].sum(axis=1)
+        if len(self.roots) > 1:
+            proba /= len(self.roots)
+        return proba
+
+    def predict(self, X):
+        """En olası sınıf etiketleri (eşitlikte ilk sınıf)"""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def export_model(model):
+    """DecisionTreeClassifier ya da RandomForestClassifier modelini FlatTreeModel'e çevirir
+
+    scikit-learn içe aktarılmaz; modelin tree_ dizileri okunur.
+    """
+    trees = [estimator.tree_ for estimator in getattr(model, "estimators_", [model])]
+
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        nodes = np.arange(tree.node_count)
+        leaf = tree.children_left < 0
+
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(np.where(leaf, 0.0, tree.threshold))
+        lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+        rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+
+        # Tek çıktılı sınıflandırıcı: (düğüm, 1, sınıf) -> (düğüm, sınıf)
+        value = np.array(tree.value[:, 0, :], dtype=np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        if not np.allclose(normalizer, 1.0):
+            # scikit-learn < 1.4 düğümlerde örnek sayılarını tutar ve tahminde satır toplamına böler;
+            # yeni sürümler oranları tutar ve olduğu gibi kullanır (yeniden bölmek son biti değiştirir)
+            normalizer[normalizer == 0.0] = 1.0
+            value = value / normalizer
+        values.append(value)
+
+        roots.append(offset)
+        offset += tree.node_count
+
+    return FlatTreeModel(
+        feature=np.concatenate(features).astype(np.intp),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        left=np.concatenate(lefts).astype(np.intp),
+        right=np.concatenate(rights).astype(np.intp),
+        value=np.concatenate(values),
+        roots=np.array(roots, dtype=np.intp),
+        classes=np.asarray(model.classes_).astype(str),
+        max_depth=max(tree.max_depth for tree in trees),
+        canonical_symmetry=getattr(model, "canonical_symmetry", False),
+    )
+
+
+def save_flat_model(flat, path):
+    """Düz modeli sıkıştırılmış .npz dosyasına yazar (pickle kullanılmaz)"""
+    np.savez_compressed(path, feature=flat.feature, threshold=flat.threshold, left=flat.left,
+                        right=flat.right, value=flat.value, roots=flat.roots, classes=flat.classes_,
+                        max_depth=flat.max_depth, canonical_symmetry=flat.canonical_symmetry)
+
+
+def load_flat_model(path):
+    """save_flat_model ile yazılmış modeli yükler"""
+    with np.load(path, allow_pickle=False) as data:
+        return FlatTreeModel(
+            feature=data["feature"].astype(np.intp),
+            threshold=data["threshold"],
+            left=data["left"].astype(np.intp),
+            right=data["right"].astype(np.intp),
+            value=data["value"],
+            roots=data["roots"].astype(np.intp),
+            classes=data["classes"],
+            max_depth=int(data["max_depth"]),
+            canonical_symmetry=bool(data["canonical_symmetry"]),
+        )
+
+
+# Komut satırından dönüştürme: python flat_model.py models/sos_dt_5x5_....pkl [...]
+if __name__ == "__main__":
+    for pkl_path in sys.argv[1:]:
+        with open(pkl_path, 'rb') as f:
+            model = pickle.load(f)
+        npz_path = pkl_path[:-len(".pkl")] + ".npz"
+        save_flat_model(export_model(model), npz_path)
+        print(f"Düz model kaydedildi: {npz_path}")
@@ -0,0 +1,94 @@
+from array import array  # Hamleleri küçük tamsayı dizisinde tutmak için
+import numpy as np  # Konumları toplu halde dizi olarak kurmak için
+
+
+# Harf kodları (kod = hücre * 4 + harf kodu * 2 + SOS bayrağı)
+LETTER_CODES = {'S': 0, 'O': 1}
+LETTERS = ('S', 'O')
+
+
+def encode_move(cell, letter, formed_sos):
+    """Bir hamleyi tek bir küçük tamsayıya çevirir"""
+    return cell * 4 + LETTER_CODES[letter] * 2 + (1 if formed_sos else 0)
+
+
+def decode_move(code):
+    """Tamsayı hamle kodunu (hücre, harf, SOS oluştu mu) olarak çözer"""
+    return code >> 2, LETTERS[(code >> 1) & 1], bool(code & 1)
+
+
+# Bir oyunun hamlelerini sıkıştırılmış biçimde tutan kayıt (moves_history yerine)
+class GameRecord:
+    __slots__ = ("size", "codes")
+
+    def __init__(self, size, codes=()):
+        self.size = size  # Tahta boyutu
+        self.codes = array('h', codes)  # Hamle kodları (hamle başına 2 bayt)
+
+    @classmethod
+    def from_moves(cls, moves, size):
+        """Eski biçimdeki hamle sözlükleri listesinden kayıt oluşturur"""
+        record = cls(size)
+        for move in moves:
+            record.append(move["row"], move["col"], move["letter"], move.get("formed_sos", False))
+        return record
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, row, col, letter, formed_sos):
+        """Oynanan hamleyi kayda ekler"""
+        self.codes.append(encode_move(row * self.size + col, letter, formed_sos))
+
+    def pop(self):
+        """Son hamleyi kayıttan çıkarır"""
+        return self.codes.pop()
+
+    def __iter__(self):
+        """Hamleleri eski moves_history sözlükleri biçiminde (tahta kopyası olmadan) verir"""
+        player = 1
+        for code in self.codes:
+            cell, letter, formed_sos = decode_move(code)
+            row, col = divmod(cell, self.size)
+            yield {"player": player, "row": row, "col": col, "letter": letter, "formed_sos": formed_sos}
+            if not formed_sos:
+                player = 3 - player  # SOS yapılmadıysa sıra karşı oyuncuya geçer
+
+    def board_state(self, index):
+        """index numaralı hamleden sonraki tahtayı hamle listesinden yeniden kurar"""
+        board = [[' ' for _ in range(self.size)] for _ in range(self.size)]
+        for code in self.codes[:index + 1]:
+            cell, letter, _ = decode_move(code)
+            row, col = divmod(cell, self.size)
+            board[row][col] = letter
+        return board
+
+    def iter_positions(self):
+        """Tüm hamleleri tek geçişte (hamle, hamle sonrası tahta) olarak verir
+
+        Her adımda aynı tahta listesi güncellenir; saklanacaksa kopyalanmalıdır.
+        """
+        board = [[' ' for _ in range(self.size)] for _ in range(self.size)]
+        for move in self:
+            board[move["row"]][move["col"]] = move["letter"]
+            yield move, board
+
+    def codes_array(self):
+        """Hamle kodlarını kopyalamadan NumPy dizisi olarak döndürür"""
+        return np.frombuffer(self.codes, dtype=np.int16)
+
+    def positions_array(self):
+        """Her hamleden sonraki tahtayı (hamle sayısı, size, size) int8 dizisi olarak kurar
+
+        Hücre değerleri özelliklerle aynıdır: 0 boş, 1 'S', 2 'O'.
+        """
+        codes = self.codes_array()
+        num_moves = len(codes)
+
+        # Her satıra sadece o hamlenin harfini yaz, sonra satırlar boyunca biriktir
+        # (her hücre bir kez dolduğundan kümülatif toplam hamle sonrası tahtayı verir)
+        boards = np.zeros((num_moves, self.size * self.size), dtype=np.int8)
+        boards[np.arange(num_moves), codes >> 2] = ((codes >> 1) & 1) + 1
+        np.cumsum(boards, axis=0, out=boards)
+
+        return boards.reshape(num_moves, self.size, self.size)
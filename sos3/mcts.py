@@ -0,0 +1,243 @@
+import math  # UCT formülü için
+import multiprocessing  # Ağaçları birden çok süreçte aramak için
+import os  # Çekirdek sayısı için
+import random  # Rastgele oyun sonları için
+import threading  # Süreç havuzunu arama ile kapatma arasında korumak için
+import time  # Süre sınırı için
+from bitboard import BitboardSOSBoard, threat_masks  # Hızlı oyun motoru (SOSBoard ile aynı arayüz)
+
+
+# Monte Carlo ağacında bir hamle düğümü
+class MCTSNode:
+    __slots__ = ("move", "player", "children", "untried", "visits", "wins")
+
+    def __init__(self, move=None, player=None, untried=None):
+        self.move = move  # Bu düğüme getiren hamle (row, col, letter)
+        self.player = player  # Hamleyi yapan oyuncu (kazançlar onun gözünden sayılır)
+        self.children = []  # Açılmış alt düğümler
+        self.untried = untried  # Henüz açılmamış hamleler
+        self.visits = 0  # Ziyaret sayısı
+        self.wins = 0.0  # Toplam sonuç (0-1 aralığına sıkıştırılmış skor farkı)
+
+    def select_child(self, exploration):
+        """UCT değeri en yüksek alt düğümü seçer"""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits +
+                   exploration * math.sqrt(log_visits / child.visits))
+
+
+def greedy_playout_move(game):
+    """Oyun sonu politikası: SOS yapan bir hamle varsa onu, yoksa rastgele hamleyi seçer"""
+    empty = game.empty_bits()
+    s_threats, o_threats = threat_masks(game.s_bits, game.o_bits, empty, game.masks["shifts"])
+    threats = s_threats | o_threats
+    if threats:
+        low = threats & -threats
+        row, col = divmod(low.bit_length() - 1, game.size)
+        return (row, col, 'S') if s_threats & low else (row, col, 'O')
+    return game.rule_based_move_easy()
+
+
+def safe_playout_move(game, tries=8):
+    """Oyun sonu politikası: açık SOS'u alır; yoksa rakibe SOS bırakmayan rastgele bir hamle arar
+
+    En fazla tries rastgele hamle denenir, hepsi SOS bırakıyorsa sonuncusu oynanır.
+    """
+    empty = game.empty_bits()
+    shifts = game.masks["shifts"]
+    s_threats, o_threats = threat_masks(game.s_bits, game.o_bits, empty, shifts)
+    threats = s_threats | o_threats
+    if threats:
+        low = threats & -threats
+        row, col = divmod(low.bit_length() - 1, game.size)
+        return (row, col, 'S') if s_threats & low else (row, col, 'O')
+
+    moves = game.get_possible_moves()
+    for _ in range(tries):
+        row, col, letter = move = random.choice(moves)
+        bit = 1 << (row * game.size + col)
+        s_bits = game.s_bits | bit if letter == 'S' else game.s_bits
+        o_bits = game.o_bits | bit if letter == 'O' else game.o_bits
+        s_after, o_after = threat_masks(s_bits, o_bits, empty & ~bit, shifts)
+        if not (s_after | o_after):
+            return move  # Rakibe SOS bırakmıyor
+    return move
+
+
+def expansion_order(game):
+    """Düğümde açılacak hamleleri pop() ile en umut verici olan önce gelecek şekilde döndürür
+
+    Sıra: SOS yapan hamleler, sonra rakibe SOS bırakmayan hamleler (gruplar kendi içinde karışık).
+    Rakibe SOS bırakan hamleler sadece başka hamle yoksa açılır; aksi halde az ziyaret edilen
+    düğümlerin ortalaması bu hatalı hamlelerle bozulur (ekstra hamlede oyuncunun kendi hataları,
+    diğer hamlelerde rakibin hataları sayılır ve değerler sistematik olarak kayar).
+    """
+    empty = game.empty_bits()
+    shifts = game.masks["shifts"]
+    s_threats, o_threats = threat_masks(game.s_bits, game.o_bits, empty, shifts)
+
+    captures, safe, unsafe = [], [], []
+    for move in game.get_possible_moves():
+        row, col, letter = move
+        bit = 1 << (row * game.size + col)
+        if (s_threats if letter == 'S' else o_threats) & bit:
+            captures.append(move)
+            continue
+        s_bits = game.s_bits | bit if letter == 'S' else game.s_bits
+        o_bits = game.o_bits | bit if letter == 'O' else game.o_bits
+        s_after, o_after = threat_masks(s_bits, o_bits, empty & ~bit, shifts)
+        (unsafe if s_after | o_after else safe).append(move)
+
+    random.shuffle(captures)
+    random.shuffle(safe)
+    if captures or safe:
+        return safe + captures  # pop() sondan alır
+    random.shuffle(unsafe)
+    return unsafe
+
+
+# Oyun sonlarında kullanılabilecek politikalar
+PLAYOUT_POLICIES = {
+    "random": lambda game: game.rule_based_move_easy(),  # Tamamen rastgele (en hızlı)
+    "greedy": greedy_playout_move,  # Açık SOS'u alan rastgele oyuncu
+    "safe": safe_playout_move,  # Açık SOS'u alan, rakibe SOS bırakmamaya çalışan oyuncu
+}
+
+
+def run_tree(board, current_player, scores, playouts, time_limit_ms, seed=None,
+             policy="safe", exploration=0.7, margin_scale=4.0, should_stop=None):
+    """Tek bir MCTS ağacını playouts oyun sonu ya da süre dolana kadar arar
+
+    should_stop verilirse (argümansız, True dönünce arama kesilir) süre kontrolüyle birlikte sorulur.
+    Kök hamlelerinin istatistiklerini {hamle: (ziyaret, kazanç)} olarak döndürür.
+    Tahta kopyalanmaz: seçilen yol ve oyun sonu make_move ile oynanıp unmake_move ile geri alınır.
+    """
+    rng_state = random.getstate()
+    random.seed(seed)
+    playout_move = PLAYOUT_POLICIES[policy]
+
+    game = BitboardSOSBoard.from_position(board, current_player, scores)
+    root = MCTSNode(untried=expansion_order(game))
+    deadline = time.perf_counter() + time_limit_ms / 1000
+
+    try:
+        for done in range(playouts):
+            if done & 15 == 0 and (time.perf_counter() > deadline or (should_stop and should_stop())):
+                break
+
+            node = root
+            path = [root]
+            depth = 0
+
+            # 1. Seçim: tüm hamleleri açılmış düğümlerde UCT ile in
+            while not node.untried and node.children:
+                node = node.select_child(exploration)
+                game.make_move(*node.move)
+                path.append(node)
+                depth += 1
+
+            # 2. Genişletme: açılmamış bir hamleyi ağaca ekle
+            if node.untried:
+                move = node.untried.pop()
+                player = game.current_player
+                game.make_move(*move)
+                depth += 1
+                child = MCTSNode(move, player, expansion_order(game))
+                node.children.append(child)
+                path.append(child)
+
+            # 3. Oyun sonu: oyun bitene kadar politika ile oyna
+            while not game.game_over:
+                game.make_move(*playout_move(game))
+                depth += 1
+
+            # 4. Geri yayılım: her düğüm, hamlesini yapan oyuncunun sonucuyla güncellenir
+            # (skor farkı 0-1 aralığına sıkıştırılır: sadece kazan/kaybet yerine farkı da öğrenir)
+            result = 0.5 + 0.5 * math.tanh((game.scores[1] - game.scores[2]) / margin_scale)
+            for visited in path:
+                visited.visits += 1
+                if visited.player == 1:
+                    visited.wins += result
+                elif visited.player == 2:
+                    visited.wins += 1.0 - result
+
+            for _ in range(depth):
+                game.unmake_move()
+    finally:
+        random.setstate(rng_state)
+
+    return {child.move: (child.visits, child.wins) for child in root.children}
+
+
+def _run_tree_task(task):
+    """Süreç havuzundaki işçide bir ağaç arar"""
+    return run_tree(*task)
+
+
+# Kök paralelliği: bağımsız ağaçları ayrı süreçlerde arayıp kök istatistiklerini birleştirir
+class MCTSPlayer:
+    def __init__(self, n_workers=None, playouts=4000, time_limit_ms=1000, policy="safe",
+                 exploration=0.7):
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1  # Varsayılan: tüm çekirdekler
+        self.n_workers = max(1, n_workers)  # Ağaç (süreç) sayısı
+        self.playouts = playouts  # Hamle başına toplam oyun sonu sayısı (ağaçlara bölünür)
+        self.time_limit_ms = time_limit_ms  # Hamle başına süre sınırı (milisaniye)
+        self.policy = policy  # Oyun sonu politikası ("random", "greedy" ya da "safe")
+        self.exploration = exploration  # UCT keşif katsayısı
+        self.pool = None  # Süreç havuzu (ilk hamlede açılır, hamleler arasında korunur)
+        self.lock = threading.Lock()  # Havuz bir aramanın ortasında kapatılmasın
+        self.last_stats = {}  # Son aramanın birleşik kök istatistikleri
+
+    def choose_move(self, board, current_player=1, scores=None, seed=None, should_stop=None):
+        """Tahta listesi için en çok ziyaret edilen kök hamlesini (row, col, letter) döndürür
+
+        should_stop verilirse arama sürerken yoklanır; True dönerse arama beklenmeden None döner
+        (süreçlerdeki ağaçlar kendi süre sınırlarında biter, sonuçları atılır).
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 31)
+
+        # Oyun sonları ağaçlara eşit bölünür; her ağaç kendi tohumuyla arar
+        share, extra = divmod(self.playouts, self.n_workers)
+        tasks = [(board, current_player, scores, share + (i < extra), self.time_limit_ms,
+                  seed + i, self.policy, self.exploration) for i in range(self.n_workers)]
+
+        with self.lock:
+            if self.n_workers == 1:
+                results = [run_tree(*tasks[0], should_stop=should_stop)]
+            else:
+                if self.pool is None:
+                    self.pool = multiprocessing.Pool(processes=self.n_workers)
+                pending = self.pool.map_async(_run_tree_task, tasks)
+                while not pending.ready():
+                    if should_stop and should_stop():
+                        return None
+                    pending.wait(0.02)  # İptal 20 ms içinde fark edilir
+                results = pending.get()
+
+            if should_stop and should_stop():
+                return None
+
+        # Ağaçların kök ziyaret sayılarını ve kazançlarını topla
+        merged = {}
+        for stats in results:
+            for move, (visits, wins) in stats.items():
+                total_visits, total_wins = merged.get(move, (0, 0.0))
+                merged[move] = (total_visits + visits, total_wins + wins)
+        self.last_stats = merged
+
+        if not merged:
+            return None
+        return max(merged, key=lambda move: merged[move])
+
+    def close(self):
+        """Süreç havuzunu kapatır (iptal edilmiş aramaların ağaçları beklenmez)
+
+        Sonraki choose_move havuzu yeniden açar.
+        """
+        with self.lock:
+            if self.pool is not None:
+                self.pool.terminate()
+                self.pool.join()
+                self.pool = None
@@ -0,0 +1,225 @@
+import os  # Dosya/dizin işlemleri için
+import re  # Eski model dosya adlarını ayrıştırmak için
+import sys  # Komut satırı argümanları için
+import gzip  # Modelleri sıkıştırılmış kaydetmek için
+import json  # İndeks dosyası için
+import pickle  # Modelleri dosyaya kaydetmek/yüklemek için
+import tempfile  # Atomik yazmada benzersiz geçici dosya için
+from datetime import datetime  # Kayıt zamanı için
+
+
+# İndeks dosyasının adı (modeller klasöründe)
+INDEX_NAME = "index.json"
+
+# Her (tip, boyut) için tutulacak en yeni model sayısı
+DEFAULT_KEEP = 3
+
+# sos_<tip>_<boyut>x<boyut>_<zaman>.<uzantı> biçimindeki model dosyaları
+MODEL_NAME = re.compile(r"sos_(dt|rf)_(\d+)x\2_(\d{8}_\d{6})\.(pkl|pkl\.gz|npz)$")
+
+
+def _atomic_write(path, write):
+    """write(dosya) ile geçici dosyaya yazar, sonra tek adımda yerine koyar (yarım dosya görünmez)
+
+    Geçici dosya aynı klasörde benzersiz adla açılır; aynı dosyayı eşzamanlı yazan iki iş
+    parçacığı (ör. yükleyici ve oyun başlatma) birbirinin geçici dosyasını ezmez.
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)  # Yazma yarıda kaldı
+
+
+# Modeller klasörünün indeksi: hangi dosya hangi tip ve boyut için, ne zaman, hangi başarıyla
+class ModelRegistry:
+    """Her kayıt: {"type", "size", "created", "score", "file", "bytes", "flat_file", "flat_bytes"}.
+
+    file sıkıştırılmış pickle (scikit-learn modeli), flat_file ise oyunda scikit-learn
+    olmadan yüklenen düz modeldir (bkz. flat_model). (tip, boyut) -> en yeni kayıt sözlüğü
+    sayesinde arama dosyaları sıralamadan ve açmadan yapılır.
+
+    İndeks yerel bir dosyadır (depoya konmaz): yoksa ya da klasöre elle model dosyası
+    bırakılmışsa dosya adlarından yeniden kurulur.
+    """
+
+    def __init__(self, models_dir="models", keep=DEFAULT_KEEP):
+        self.models_dir = models_dir  # Modellerin bulunduğu klasör
+        self.keep = keep  # Her (tip, boyut) için tutulacak model sayısı
+        self.index_path = os.path.join(models_dir, INDEX_NAME)
+        self.entries = []  # Tüm kayıtlar
+        self.latest = {}  # (tip, boyut) -> en yeni kayıt
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)["models"]
+            self._update_latest()
+        if os.path.isdir(models_dir) and self._unindexed_files():
+            self.rebuild()  # İndeks yok ya da klasöre indekste olmayan model bırakılmış
+
+    def _update_latest(self):
+        """(tip, boyut) -> en yeni kayıt sözlüğünü yeniden kurar"""
+        self.latest = {}
+        for entry in self.entries:
+            key = (entry["type"], entry["size"])
+            if key not in self.latest or entry["created"] > self.latest[key]["created"]:
+                self.latest[key] = entry
+
+    def _unindexed_files(self):
+        """Klasördeki, indekste karşılığı olmayan model dosyalarının adları
+
+        Kaydı olmayan (tip, zaman) modelleri ve kaydında düz modeli olmayan .npz dosyaları sayılır.
+        """
+        indexed = {(entry["type"], entry["created"]): entry for entry in self.entries}
+        unindexed = []
+        for name in os.listdir(self.models_dir):
+            match = MODEL_NAME.match(name)
+            if match is None:
+                continue
+            ai_type, _, created, extension = match.groups()
+            entry = indexed.get((ai_type, created))
+            if entry is None or (extension == "npz" and entry["flat_file"] is None):
+                unindexed.append(name)
+        return unindexed
+
+    def _save_index(self):
+        """İndeksi atomik olarak yazar"""
+        data = json.dumps({"models": self.entries}, indent=1, ensure_ascii=False).encode('utf-8')
+        _atomic_write(self.index_path, lambda f: f.write(data))
+
+    def rebuild(self):
+        """İndeksi klasördeki dosya adlarından yeniden kurar
+
+        İndekste zaten olan modellerin başarı oranları korunur; yeni dosyalarınki bilinmez.
+        """
+        known_scores = {(entry["type"], entry["created"]): entry["score"] for entry in self.entries}
+        entries = {}
+        for name in sorted(os.listdir(self.models_dir)):
+            match = MODEL_NAME.match(name)
+            if match is None:
+                continue
+            ai_type, size, created, extension = match.groups()
+            entry = entries.setdefault((ai_type, created), {
+                "type": ai_type, "size": int(size), "created": created,
+                "score": known_scores.get((ai_type, created)),
+                "file": None, "bytes": 0, "flat_file": None, "flat_bytes": 0,
+            })
+            file_bytes = os.path.getsize(os.path.join(self.models_dir, name))
+            if extension == "npz":
+                entry["flat_file"], entry["flat_bytes"] = name, file_bytes
+            elif entry["file"] is None or extension == "pkl.gz":
+                entry["file"], entry["bytes"] = name, file_bytes
+
+        self.entries = sorted(entries.values(), key=lambda entry: entry["created"])
+        self._update_latest()
+        self._save_index()
+
+    def lookup(self, ai_type, size):
+        """Verilen tip ("dt"/"rf") ve tahta boyutu için en yeni kayıt, yoksa None"""
+        entry = self.latest.get((ai_type, size))
+        if entry is not None and not os.path.exists(self.model_path(entry)):
+            # İndeks klasörle uyuşmuyor (dosya elle silinmiş): bir kez yeniden kur
+            self.rebuild()
+            entry = self.latest.get((ai_type, size))
+        return entry
+
+    def model_path(self, entry):
+        """Kaydın oyunda yüklenecek dosyası (varsa düz model)"""
+        return os.path.join(self.models_dir, entry["flat_file"] or entry["file"])
+
+    def load(self, entry):
+        """Kaydın modelini oyunda kullanılacak FlatTreeModel olarak yükler
+
+        Düz model varsa scikit-learn gerekmez; yoksa pickle açılıp düz modele çevrilir.
+        """
+        from flat_model import load_flat_model, export_model
+        path = self.model_path(entry)
+        if path.endswith(".npz"):
+            return load_flat_model(path)
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, 'rb') as f:
+            return export_model(pickle.load(f))
+
+    def register(self, ai_type, size, model, score=None, created=None):
+        """Modeli sıkıştırılmış pickle ve düz model olarak atomik kaydeder, indekse ekler ve eski
+        modelleri budar; yeni kaydı döndürür"""
+        from flat_model import export_model, save_flat_model
+
+        os.makedirs(self.models_dir, exist_ok=True)
+        if created is None:
+            created = datetime.now().strftime("%Y%m%d_%H%M%S")  # Zaman etiketi oluştur
+        stem = f"sos_{ai_type}_{size}x{size}_{created}"
+
+        pickle_name = stem + ".pkl.gz"
+        pickle_path = os.path.join(self.models_dir, pickle_name)
+        _atomic_write(pickle_path, lambda f: _write_gzip_pickle(f, model))
+
+        flat_name = stem + ".npz"
+        flat_path = os.path.join(self.models_dir, flat_name)
+        flat = export_model(model)
+        _atomic_write(flat_path, lambda f: save_flat_model(flat, f))
+
+        entry = {
+            "type": ai_type, "size": size, "created": created,
+            "score": None if score is None else float(score),
+            "file": pickle_name, "bytes": os.path.getsize(pickle_path),
+            "flat_file": flat_name, "flat_bytes": os.path.getsize(flat_path),
+        }
+        self.entries = [e for e in self.entries if e["file"] != pickle_name] + [entry]
+        self.prune(save=False)
+        self._update_latest()
+        self._save_index()
+        return entry
+
+    def prune(self, save=True):
+        """Her (tip, boyut) için en yeni keep kayıt dışındakileri dosyalarıyla birlikte siler"""
+        kept = []
+        groups = {}
+        for entry in sorted(self.entries, key=lambda entry: entry["created"], reverse=True):
+            count = groups.get((entry["type"], entry["size"]), 0)
+            if count < self.keep:
+                kept.append(entry)
+                groups[(entry["type"], entry["size"])] = count + 1
+                continue
+            for name in (entry["file"], entry["flat_file"]):
+                if name:
+                    try:
+                        os.remove(os.path.join(self.models_dir, name))
+                    except FileNotFoundError:
+                        pass
+
+        self.entries = sorted(kept, key=lambda entry: entry["created"])
+        if save:
+            self._update_latest()
+            self._save_index()
+
+    def total_bytes(self):
+        """Kayıtlı modellerin diskte kapladığı toplam bayt"""
+        return sum(entry["bytes"] + entry["flat_bytes"] for entry in self.entries)
+
+
+def _write_gzip_pickle(f, model):
+    """Modeli açık dosyaya gzip ile sıkıştırılmış pickle olarak yazar"""
+    with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+        pickle.dump(model, gz, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# Komut satırı: python model_registry.py [rebuild|prune|list]
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    registry = ModelRegistry()
+
+    if command == "rebuild":
+        registry.rebuild()
+    elif command == "prune":
+        registry.prune()
+
+    for entry in registry.entries:
+        score = "-" if entry["score"] is None else f"{entry['score']:.4f}"
+        print(f"{entry['type']} {entry['size']}x{entry['size']} {entry['created']} doğruluk={score} "
+              f"{entry['bytes'] + entry['flat_bytes']} bayt")
+    print(f"Toplam: {len(registry.entries)} model, {registry.total_bytes()} bayt")
@@ -0,0 +1,142 @@
+import os  # Dosya/dizin işlemleri için
+import sys  # Komut satırı argümanları için
+import time  # Süre ölçümü için
+from itertools import combinations, product  # Açılış konumlarını saymak için
+import numpy as np  # Tahtaları toplu halde kanonikleştirmek ve kitabı saklamak için
+from symmetry import get_symmetry_tables  # Kare tahtanın 8 simetrisinin hücre eşlemeleri
+
+
+# Kitap dosyalarının varsayılan klasörü
+BOOK_DIR = "books"
+
+# Yüklenmiş kitapları tutan önbellek (boyut -> kitap ya da None)
+_BOOK_CACHE = {}
+
+
+def book_path(size, directory=BOOK_DIR):
+    """Verilen boyut için kitap dosyasının yolu"""
+    return os.path.join(directory, f"opening_book_{size}x{size}.npz")
+
+
+def canonical_codes(boards):
+    """(N, hücre) int8 tahtaların (0 boş, 1 S, 2 O) kanonik anahtarları
+
+    Anahtar, tahtanın 8 simetrisinin taban-3 kodlarının en küçüğüdür (hücre i'nin basamağı 3^i).
+    Kodlar uint64 ile hesaplandığından en fazla 6x6 tahtada geçerlidir (bkz. build_opening_book).
+    """
+    size = int(round(boards.shape[1] ** 0.5))
+    gathers = get_symmetry_tables(size)["gathers"]
+    powers = 3 ** np.arange(boards.shape[1], dtype=np.uint64)
+    variants = boards[:, gathers].astype(np.uint64)  # (N, 8, hücre)
+    return (variants @ powers).min(axis=1)
+
+
+# Açılış konumları için önceden hesaplanmış zor seviye hamleleri
+class OpeningBook:
+    """Anahtar: kanonik tahtanın taban-3 kodu, değer: kanonik tahtadaki hamle (hücre * 2 + harf biti).
+
+    Birbirinin döndürülmüşü ya da aynası olan tahtalar tek kayıtta birleşir; hamle sorgudaki
+    tahtaya dönüşümün tersiyle geri çevrilir. Sorgu sadece dolu hücreleri gezer, NumPy kullanmaz.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.size = int(data["size"])  # Tahta boyutu
+            self.max_plies = int(data["max_plies"])  # Kitaptaki en fazla dolu hücre sayısı
+            self.moves = dict(zip(data["keys"].tolist(), data["moves"].tolist()))
+
+        tables = get_symmetry_tables(self.size)
+        # Her simetri için hücrenin kodda taşıdığı basamak değeri (3^yeni hücre) ve ters eşleme
+        self.digit_values = [[3 ** int(cell) for cell in cell_map] for cell_map in tables["cell_maps"]]
+        self.gathers = tables["gathers"].tolist()
+
+    def lookup(self, board):
+        """Tahta listesi için kitaptaki hamle (row, col, letter); kitapta yoksa None"""
+        filled = []  # (hücre, harf değeri) çiftleri
+        for i, row in enumerate(board):
+            for j, letter in enumerate(row):
+                if letter != ' ':
+                    filled.append((i * self.size + j, 1 if letter == 'S' else 2))
+        if len(filled) > self.max_plies:
+            return None
+
+        # En küçük kodu veren simetri kanonik tahtayı verir
+        key, transform = min((sum(value * digits[cell] for cell, value in filled), t)
+                             for t, digits in enumerate(self.digit_values))
+        code = self.moves.get(key)
+        if code is None:
+            return None
+
+        cell, letter_bit = divmod(code, 2)
+        row, col = divmod(self.gathers[transform][cell], self.size)
+        return row, col, 'O' if letter_bit else 'S'
+
+
+def build_opening_book(size, max_plies=4, directory=BOOK_DIR):
+    """En fazla max_plies dolu hücreli tüm tahtalar için zor seviye hamlesini hesaplayıp kaydeder
+
+    Tahtalar önce kanonikleştirilip tekilleştirilir; her kanonik tahta için hamle bir kez
+    BitboardSOSBoard.rule_based_move_hard ile hesaplanır. Dosyanın yolunu döndürür.
+    """
+    from bitboard import BitboardSOSBoard  # Döngüsel içe aktarmayı önlemek için burada
+
+    total_cells = size * size
+    max_plies = min(max_plies, total_cells - 1)
+
+    # Anahtarlar uint64 taban-3 kodlarıdır; 7x7'de 3^49 > 2^64 olduğundan kodlar taşar ve
+    # sorgudaki Python tamsayılarıyla eşleşmez (6x6'ya kadar hamle kodları da uint8'e sığar)
+    if 3 ** total_cells > 1 << 64:
+        raise ValueError(f"{size}x{size} tahta için açılış kitabı anahtarları 64 bite sığmaz (en fazla 6x6)")
+
+    # 1. Tüm açılış tahtalarını üret ve kanonik kodlarını tekilleştir
+    codes = []
+    for plies in range(max_plies + 1):
+        cells = np.array(list(combinations(range(total_cells), plies)), dtype=np.intp)  # (küme, plies)
+        letters = np.array(list(product((1, 2), repeat=plies)), dtype=np.int8)  # (dizilim, plies)
+        boards = np.zeros((len(cells) * len(letters), total_cells), dtype=np.int8)
+        rows = np.arange(len(boards))[:, None]
+        boards[rows, np.repeat(cells, len(letters), axis=0)] = np.tile(letters, (len(cells), 1))
+
+        codes.append(np.unique(canonical_codes(boards)))
+        print(f"{plies} dolu hücre: {len(boards)} tahta, {len(codes[-1])} kanonik tahta")  # Durum bildirimi
+    keys = np.concatenate(codes)
+
+    # 2. Her kanonik tahta için hamleyi hesapla (eski kitap kullanılmasın diye önbellek kapatılır)
+    _BOOK_CACHE[size] = None
+    try:
+        moves = np.empty(len(keys), dtype=np.uint8)
+        for index, key in enumerate(keys.tolist()):
+            board = [[' '] * size for _ in range(size)]
+            for cell in range(total_cells):
+                key, value = divmod(key, 3)
+                board[cell // size][cell % size] = " SO"[value]
+            row, col, letter = BitboardSOSBoard.from_position(board).rule_based_move_hard()
+            moves[index] = (row * size + col) * 2 + (letter == 'O')
+    finally:
+        _BOOK_CACHE.pop(size, None)  # Yeni kitap bir sonraki aramada yüklensin
+
+    os.makedirs(directory, exist_ok=True)
+    path = book_path(size, directory)
+    np.savez_compressed(path, size=size, max_plies=max_plies, keys=keys, moves=moves)
+    return path
+
+
+def get_opening_book(size, directory=BOOK_DIR):
+    """Verilen boyut için açılış kitabını (bir kez) yükler; dosya yoksa None"""
+    if size not in _BOOK_CACHE:
+        path = book_path(size, directory)
+        _BOOK_CACHE[size] = OpeningBook(path) if os.path.exists(path) else None
+    return _BOOK_CACHE[size]
+
+
+# Komut satırından kitap oluşturma: python opening_book.py <boyut> <dolu hücre sayısı>
+if __name__ == "__main__":
+    start_time = time.time()  # Başlangıç zamanını al
+
+    board_size = int(sys.argv[1]) if len(sys.argv) > 1 else 5  # Tahta boyutu
+    max_plies = int(sys.argv[2]) if len(sys.argv) > 2 else 4  # Kitaptaki en fazla dolu hücre sayısı
+
+    print(f"Kitap dosyası: {build_opening_book(board_size, max_plies)}")
+
+    elapsed_time = time.time() - start_time  # Geçen süreyi hesapla
+    print(f"Toplam süre: {elapsed_time:.2f} saniye")  # Süreyi yazdır
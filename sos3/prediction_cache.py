@@ -0,0 +1,42 @@
+from collections import OrderedDict  # Kullanım sırasını tutan sözlük (LRU için)
+
+
+# Model tahminlerini konum anahtarıyla saklayan, en uzun süre kullanılmayanı atan sınırlı önbellek
+class PredictionCache:
+    """Anahtar: tahtanın Zobrist anahtarı, değer: modelin o tahta için önerdiği hamle.
+
+    Önbellek tek bir modelin çıktısını tutar; model değişince yenisiyle değiştirilmelidir.
+    Kilit kullanılmaz: aynı anda tek bir iş parçacığı (AI hesaplaması) kullanmalıdır.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity  # En fazla kayıt sayısı
+        self.entries = OrderedDict()  # Eskiden yeniye kullanım sırasıyla kayıtlar
+
+        self.hits = 0  # Önbellekten cevaplanan sorgu sayısı
+        self.misses = 0  # Modelin çalıştırıldığı sorgu sayısı
+
+    def get(self, key):
+        """Anahtarın kaydını döndürür (en son kullanılan olarak işaretler), yoksa None"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Kaydı ekler; kapasite aşılırsa en uzun süre kullanılmayan kayıt atılır"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Tüm kayıtları ve sayaçları siler (ör. yeni model yüklendiğinde)"""
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
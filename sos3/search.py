@@ -0,0 +1,280 @@
+import time  # Arama süresini ölçmek için
+from sos_lines import SOS_MIDDLE  # SOS üçlüsündeki hücre rolleri
+from threat_index import ThreatIndex  # SOS tamamlayan hamlelerin artımlı indeksi
+from zobrist import get_hasher  # Konumların Zobrist anahtarları
+from transposition import TranspositionTable, EXACT, LOWER, UPPER  # Görülen konumların sonuçları
+from tablebase import get_tablebase  # Az boş hücreli konumların kesin değerleri
+
+
+# Arama değerleri için sonsuz yerine kullanılan büyük sayı
+INF = 10 ** 6
+
+
+def evaluate_move(threats, row, col, letter):
+    """Bir hamlenin stratejik değerini hesapla (tahta olarak tehdit indeksinin tahtası kullanılır)"""
+    score = 0
+    board = threats.grid
+
+    for role, r1, c1, r2, c2, _ in threats.lines[row][col]:
+        if letter == 'S' and role != SOS_MIDDLE:
+            # r1, c1 ortadaki, r2, c2 diğer uçtaki hücre
+            if board[r1][c1] == 'O' and board[r2][c2] == ' ':
+                score += 3  # Potansiyel SOS
+            elif board[r1][c1] == ' ' and board[r2][c2] == 'S':
+                score += 2  # S-?-S durumu
+            elif board[r1][c1] == ' ' and board[r2][c2] == ' ':
+                score += 1  # Başlangıç
+
+        elif letter == 'O' and role == SOS_MIDDLE:
+            # ?-O-? durumu
+            if board[r1][c1] == 'S' and board[r2][c2] == 'S':
+                score += 10  # Kesin SOS
+            elif board[r1][c1] == 'S' and board[r2][c2] == ' ':
+                score += 3  # S-O-? durumu
+            elif board[r1][c1] == ' ' and board[r2][c2] == 'S':
+                score += 3  # ?-O-S durumu
+            elif board[r1][c1] == ' ' and board[r2][c2] == ' ':
+                score += 1  # Başlangıç
+
+    # Rakibin bu hamleden sonra SOS tamamlayabileceği her (hücre, harf) çifti için ceza
+    # (sadece bu hücreden geçen üçlülerden hesaplanır, tüm tahta yeniden taranmaz)
+    score -= 5 * threats.count_after(row, col, letter)
+
+    return score
+
+
+class SearchTimeout(Exception):
+    """Arama süresi dolduğunda aramayı kesmek için kullanılır"""
+
+
+# SOS ekstra hamlelerini hesaba katan negamax / alfa-beta arama motoru
+class AlphaBetaSearch:
+    """Değerler hamle sırası kimdeyse onun gözünden (kendi skoru - rakibin skoru) olarak hesaplanır.
+
+    SOS yapan oyuncu tekrar oynadığından böyle bir hamlenin değeri işaret değiştirmeden
+    1 + alt konumun değeridir; diğer hamlelerde sıra geçer ve değer negatiflenir.
+
+    İki oyuncunun hamleleri aynı olduğundan bu değer sadece tahtaya bağlıdır; transpozisyon
+    tablosu bu yüzden sıra ve skor farkı olmadan tahtanın Zobrist anahtarıyla kullanılır ve
+    hamleler arasında korunur.
+    """
+
+    def __init__(self, size=5, time_limit_ms=1000, max_depth=None, table_size=1 << 18):
+        self.size = size  # Tahta boyutu
+        self.time_limit_ms = time_limit_ms  # Hamle başına süre (milisaniye)
+        self.max_depth = max_depth or size * size  # En fazla arama derinliği
+
+        self.threats = None  # Aramanın üzerinde oynadığı tahta ve tehdit indeksi
+        self.empty_count = 0  # Kalan boş hücre sayısı
+        self.deadline = 0.0  # Aramanın kesileceği an
+        self.should_stop = None  # Aramayı süreden önce kesen koşul (ör. iptal edilen istek)
+        self.nodes = 0  # Ziyaret edilen düğüm sayısı
+        self.completed_depth = 0  # Tamamlanan son derinlik
+        self.best_value = 0  # Tamamlanan son derinlikteki en iyi değer
+        self.root_best = None  # Sürmekte olan derinlikte şimdiye kadarki en iyi kök hamlesi
+
+        self.hasher = get_hasher(size)  # Zobrist anahtarları
+        self.table = TranspositionTable(table_size)  # Görülen konumların sonuçları
+        self.key = 0  # Arama tahtasının Zobrist anahtarı (her hamlede güncellenir)
+        self.tablebase = get_tablebase(size)  # Oyun sonu tablosu (varsa yapraklarda kesin değer verir)
+
+    def search(self, board, time_limit_ms=None, should_stop=None):
+        """Verilen tahta (liste) için en iyi hamleyi (row, col, letter) döndürür, tahta değişmez
+
+        Derinlik 1'den başlayarak süre dolana kadar artırılır; süre dolduğunda bulunan en iyi
+        hamle döndürülür. Boş hücre yoksa None döner. should_stop verilirse (argümansız, True
+        dönünce) zaman kontrolleriyle birlikte sorulur; arama başlamadan önce ya da sürerken
+        True dönerse o ana kadarki en iyi hamleyle hemen biter.
+        """
+        if time_limit_ms is None:
+            time_limit_ms = self.time_limit_ms
+
+        # Arama kendi tahta kopyası ve tehdit indeksi üzerinde hamle yapıp geri alır
+        self.threats = ThreatIndex(self.size)
+        self.empty_count = 0
+        for i, row in enumerate(board):
+            for j, letter in enumerate(row):
+                if letter == ' ':
+                    self.empty_count += 1
+                else:
+                    self.threats.place(i, j, letter)
+        self.key = self.hasher.board_key(board)
+
+        # Konum oyun sonu tablosundaysa en iyi hamle doğrudan okunur
+        if self.tablebase is not None and self.empty_count <= self.tablebase.max_empty:
+            table_move = self.tablebase.best_move(board)
+            if table_move:
+                return table_move
+
+        moves = self.ordered_moves(2)
+        if not moves:
+            return None
+
+        self.deadline = time.perf_counter() + time_limit_ms / 1000
+        self.should_stop = should_stop
+        self.nodes = 0
+        self.completed_depth = 0
+        best_move = moves[0]  # Süre hiç yetmezse sıralamadaki ilk hamle
+
+        for depth in range(1, min(self.max_depth, self.empty_count) + 1):
+            if should_stop is not None and should_stop():
+                break  # İptal arama başlamadan ya da derinlikler arasında geldi
+            self.root_best = None
+            try:
+                self.best_value, best_move = self._search_root(moves, depth)
+            except SearchTimeout:
+                # Önceki derinliğin en iyi hamlesi ilk arandığından, yarım kalan derinlikte
+                # onu geçen bir hamle bulunduysa o daha iyidir
+                if self.root_best is not None:
+                    best_move = self.root_best
+                break
+
+            self.completed_depth = depth
+
+            # Bir sonraki derinlikte en iyi hamle ilk aranır
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+
+        return best_move
+
+    def ordered_moves(self, depth, first=None):
+        """Boş hücreler için hamleleri arama sırasıyla döndürür: önce SOS yapanlar
+
+        Derinlik 2 ve üzerindeki düğümlerde kalan hamleler evaluate_move puanına göre sıralanır;
+        yapraklara yakın düğümlerde puanlama maliyetinden kaçınılır. first verilirse
+        (transpozisyon tablosundaki en iyi hamle) en başa alınır.
+        """
+        threats = self.threats
+        captures = []
+        others = []
+
+        for i, row in enumerate(threats.grid):
+            for j, cell in enumerate(row):
+                if cell != ' ':
+                    continue
+                for letter in ('S', 'O'):
+                    if threats.completes_sos(i, j, letter):
+                        captures.append((i, j, letter))
+                    else:
+                        others.append((i, j, letter))
+
+        if depth >= 2:
+            others.sort(key=lambda move: evaluate_move(threats, *move), reverse=True)
+
+        moves = captures + others
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+
+        return moves
+
+    def _search_root(self, moves, depth):
+        """Kök hamlelerini arar ve (en iyi değer, en iyi hamle) döndürür"""
+        alpha = -INF
+        best_move = None
+
+        for move in moves:
+            value = self._move_value(move, depth, alpha, INF)
+            if best_move is None or value > alpha:
+                alpha = value
+                best_move = move
+                self.root_best = move
+
+        return alpha, best_move
+
+    def _move_value(self, move, depth, alpha, beta):
+        """Hamleyi yapar, alt konumu arar, hamleyi geri alır ve hamlenin değerini döndürür"""
+        row, col, letter = move
+        threats = self.threats
+        formed = threats.completes_sos(row, col, letter)
+
+        move_key = self.hasher.move_key(row, col, letter)
+        threats.place(row, col, letter)
+        self.key ^= move_key
+        self.empty_count -= 1
+        try:
+            if formed:
+                # Ekstra hamle: aynı oyuncu tekrar oynar, pencere 1 kayar
+                return 1 + self._negamax(depth - 1, alpha - 1, beta - 1)
+            # Sıra rakibe geçer
+            return -self._negamax(depth - 1, -beta, -alpha)
+        finally:
+            threats.remove(row, col)
+            self.key ^= move_key
+            self.empty_count += 1
+
+    def _negamax(self, depth, alpha, beta):
+        """Hamle sırasındaki oyuncunun gözünden konum değeri"""
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and (time.perf_counter() > self.deadline
+                                       or (self.should_stop is not None and self.should_stop())):
+            raise SearchTimeout()
+
+        if self.empty_count == 0:
+            return 0  # Oyun bitti, kalan skor farkı yok
+
+        # Tablodaki konumların değeri kesindir, aramaya gerek yok
+        if self.tablebase is not None and self.empty_count <= self.tablebase.max_empty:
+            return self.tablebase.value(self.threats.grid)
+
+        if depth <= 0:
+            return self._quiesce()
+
+        # Konum daha önce en az bu derinlikte arandıysa kayıtlı sonuç kullanılır
+        alpha_start = alpha
+        table_move = None
+        entry = self.table.probe(self.key)
+        if entry is not None:
+            entry_depth, value, flag, table_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best = -INF
+        best_move = None
+        for move in self.ordered_moves(depth, table_move):
+            value = self._move_value(move, depth, alpha, beta)
+            if value > best:
+                best = value
+                best_move = move
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break  # Beta kesmesi
+
+        if best <= alpha_start:
+            flag = UPPER  # Hiçbir hamle alfayı geçmedi: gerçek değer en fazla bu
+        elif best >= beta:
+            flag = LOWER  # Kesildi: gerçek değer en az bu
+        else:
+            flag = EXACT
+        self.table.store(self.key, depth, best, flag, best_move)
+
+        return best
+
+    def _quiesce(self):
+        """Derinlik bittiğinde hamle sırasındaki oyuncunun açık SOS zincirini değerlendirir
+
+        Açık bir SOS varken aramayı kesmek değeri yanıltır. Tüm alma sıralarını denemek
+        patlayacağından zor seviyedeki gibi satır sırasıyla ilk SOS tekrar tekrar alınır;
+        değer bu zincirde yapılan SOS sayısıdır (sıra hep aynı oyuncuda kalır).
+        """
+        threats = self.threats
+        taken = []
+
+        move = threats.first_threat()
+        while move is not None:
+            threats.place(*move)
+            taken.append(move)
+            move = threats.first_threat()
+
+        for row, col, _ in reversed(taken):
+            threats.remove(row, col)
+
+        return len(taken)
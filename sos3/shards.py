@@ -0,0 +1,70 @@
+import os  # Dosya/dizin işlemleri için
+import math  # Tahta boyutunu satır genişliğinden bulmak için
+import numpy as np  # Parçaları ikili dosya olarak yazıp bellek eşlemeli okumak için
+from game_record import GameRecord  # Sıkıştırılmış oyun kaydı
+
+
+# Biten oyunları sabit boyutlu ikili parçalara (shard) yazan sınıf
+class ShardWriter:
+    """Her parça games_per_shard satırlık int16 bir .npy dosyasıdır.
+
+    Satır düzeni: [hamle sayısı, hamle kodu 1, ..., hamle kodu n, -1, ...]; satır genişliği
+    1 + size * size olduğundan her oyun aynı yeri kaplar.
+    """
+
+    def __init__(self, shard_dir, board_size, games_per_shard=1000):
+        self.shard_dir = shard_dir  # Parçaların yazılacağı klasör
+        self.board_size = board_size  # Tahta boyutu
+        self.games_per_shard = games_per_shard  # Parça başına oyun sayısı
+        self.row_width = 1 + board_size * board_size  # Bir oyun satırının genişliği
+        self.buffer = []  # Henüz yazılmamış oyunlar
+        self.shard_count = 0  # Yazılan parça sayısı
+        self.paths = []  # Yazılan parçaların yolları
+
+        os.makedirs(shard_dir, exist_ok=True)  # Klasör yoksa oluştur
+
+    def add(self, record):
+        """Bir oyun ekler; parça dolduysa diske yazar ve yolunu döndürür (yoksa None)"""
+        self.buffer.append(record)
+        if len(self.buffer) >= self.games_per_shard:
+            return self.flush()
+        return None
+
+    def flush(self):
+        """Tampondaki oyunları yeni bir parça dosyasına yazar ve yolunu döndürür"""
+        if not self.buffer:
+            return None
+
+        rows = np.full((len(self.buffer), self.row_width), -1, dtype=np.int16)
+        for i, record in enumerate(self.buffer):
+            rows[i, 0] = len(record)
+            rows[i, 1:1 + len(record)] = record.codes
+
+        size = self.board_size
+        path = os.path.join(self.shard_dir, f"shard_{size}x{size}_{self.shard_count:05d}.npy")
+
+        # Önce geçici dosyaya yaz, sonra yeniden adlandır: okuyucu yarım parça görmez
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, rows)
+        os.replace(tmp_path, path)
+
+        self.buffer = []
+        self.shard_count += 1
+        self.paths.append(path)
+        return path
+
+    def close(self):
+        """Kalan oyunları son parçaya yazar ve tüm parça yollarını döndürür"""
+        self.flush()
+        return self.paths
+
+
+def iter_shard_games(path):
+    """Bir parça dosyasını bellek eşlemeyle açar ve oyunları GameRecord olarak verir"""
+    rows = np.load(path, mmap_mode='r')  # Dosya belleğe okunmaz, sayfalar gerektikçe gelir
+    size = math.isqrt(rows.shape[1] - 1)
+
+    for row in rows:
+        num_moves = int(row[0])
+        yield GameRecord(size, row[1:1 + num_moves].tolist())
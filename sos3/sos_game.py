@@ -1,9 +1,22 @@
 import tkinter as tk                      # Tkinter GUI kütüphanesi, arayüz oluşturmak için
 from tkinter import ttk, messagebox       # Gelişmiş widgetlar (ttk) ve ileti kutuları (messagebox)
 import random                            # Rastgele sayı ve seçim işlemleri için
-import pickle                            # Nesneleri dosyaya kaydetme ve yükleme için (serileştirme)
 import os                                # Dosya/dizin işlemleri ve işletim sistemi etkileşimi için
 import threading                        # Çoklu iş parçacığı (thread) ile eşzamanlı işlemler için
+import queue                            # AI iş parçacığıyla arayüz arasında istek/sonuç kuyrukları
+import time                             # AI hesaplama süresini bekleme süresinden düşmek için
+from sos_lines import get_sos_lines, completed_lines, SOS_START, SOS_MIDDLE  # Önceden hesaplanmış SOS üçlü tabloları
+from threat_index import ThreatIndex     # SOS tamamlayan hamlelerin artımlı indeksi
+from zobrist import get_hasher           # Konumların Zobrist anahtarları
+from prediction_cache import PredictionCache  # Model tahminlerinin konum anahtarlı LRU önbelleği
+from model_registry import ModelRegistry  # Model dosyalarının boyut/tip indeksi
+
+# NumPy kullanan arama modülleri (search, mcts, symmetry, tablebase, opening_book) pencere hemen
+# açılsın diye kullanıldıkları yerde içe aktarılır; arka plandaki yükleyici bunları önceden ısıtır.
+
+
+# AI sonuç kuyruğunun yoklanma aralığı (milisaniye; ~60 fps)
+AI_POLL_MS = 16
 
 
 class SOSGame:
@@ -14,10 +27,14 @@ class SOSGame:
         self.master.geometry("800x700")  # Pencere boyutu
         self.master.resizable(False, False)  # Yeniden boyutlandırmayı kapat
         self.master.configure(bg="#f0f0f0")  # Arka plan rengi
+        self.master.protocol("WM_DELETE_WINDOW", self.close_window)  # Kapanışta süreç havuzunu kapat
 
         # Temel oyun değişkenleri
         self.size = 5  # Oyun tahtası boyutu (5x5 sabit)
         self.board = []  # Oyun tahtası durumu
+        self.threats = None  # Şu an SOS tamamlayacak hamlelerin indeksi
+        self.hasher = get_hasher(self.size)  # Zobrist anahtarları
+        self.board_key = 0  # Tahtanın Zobrist anahtarı (her hamlede güncellenir)
         self.buttons = []  # Tahta üzerindeki butonlar
         self.current_player = 1  # 1 = Oyuncu, 2 = Yapay Zeka
         self.difficulty = "orta"  # Zorluk seviyesi: kolay, orta, zor, imkansız
@@ -30,51 +47,121 @@ class SOSGame:
         self.total_cells = self.size * self.size  # Toplam hücre sayısı
         self.filled_cells = 0  # Doldurulmuş hücre sayısı
 
-        # Makine öğrenmesi modelleri
+        # İmkansız seviyenin alfa-beta araması (ilk kullanımda oluşturulur, bkz. get_searcher)
+        self.searcher = None
+
+        # MCTS oyuncusu (ilk MCTS hamlesinde oluşturulur; süreç havuzu hamleler arasında korunur)
+        self.mcts_player = None
+
+        # AI hamleleri arka plandaki tek bir iş parçacığında hesaplanır, sonuçlar kuyrukla döner
+        # (arama ve MCTS nesneleri paylaşıldığı için hesaplamalar sırayla yapılır)
+        self.ai_requests = queue.Queue()  # Hesaplanacak isteklerin nesil numaraları
+        self.ai_results = queue.Queue()  # (nesil, hamle) sonuçları
+        self.ai_generation = 0  # Her yeni istekte ve iptalde artar; eski nesillerin sonuçları atılır
+        self.ai_thread = threading.Thread(target=self.ai_worker, daemon=True)
+        self.ai_thread.start()
+
+        # Makine öğrenmesi modelleri (pencere açıldıktan sonra arka planda yüklenir)
         self.dt_model = None  # Decision Tree modeli
         self.rf_model = None  # Random Forest modeli
-        self.load_models()  # Eğitimli modelleri yükle
+        self.model_status = {"dt": "yükleniyor", "rf": "yükleniyor"}  # yükleniyor, yüklendi, yok, hata
+        self.model_locks = {"dt": threading.Lock(), "rf": threading.Lock()}  # Aynı model iki kez yüklenmesin
+        self.prediction_caches = {"dt": PredictionCache(), "rf": PredictionCache()}  # Model başına tahmin önbelleği
 
         self.show_main_menu()  # Ana menüyü göster
 
+        loader = threading.Thread(target=self.load_pending_models, daemon=True)
+        loader.start()
+
     def load_models(self):
-        """Eğitilmiş modelleri yükle"""
+        """Eğitilmiş modelleri yeniden yükle (ör. eğitimden sonra en yeni dosyalar için)"""
+        for ai_type in ("dt", "rf"):
+            with self.model_locks[ai_type]:
+                self.model_status[ai_type] = "yükleniyor"
+        self.load_pending_models()
+
+    def load_pending_models(self):
+        """Arama modüllerini ısıtır ve bekleyen modelleri olası kullanım sırasıyla yükler (arka planda)"""
+        # Her AI tipinin kullandığı NumPy tabanlı modüller ve tablo dosyaları önce (hızlı ve ortak)
+        from opening_book import get_opening_book
+        from tablebase import get_tablebase
+        import mcts, search, symmetry  # Sadece içe aktarma maliyeti önceden ödenir
+        get_opening_book(self.size)
+        get_tablebase(self.size)
+
+        # Menüde varsayılan seçili olan Decision Tree önce yüklenir
+        for ai_type in ("dt", "rf"):
+            self.load_model(ai_type)
+
+    def load_model(self, ai_type):
+        """Verilen tipteki ("dt" ya da "rf") en yeni modeli henüz yüklenmediyse yükler ve döndürür"""
+        names = {"dt": "Decision Tree", "rf": "Random Forest"}
         models_dir = "models"  # Modellerin bulunduğu klasör
 
-        # Eğer klasör yoksa oluştur ve kullanıcıya uyarı ver
-        if not os.path.exists(models_dir):
-            os.makedirs(models_dir)
-            print("'models' klasörü oluşturuldu. Lütfen eğitilmiş modelleri buraya yerleştirin.")
-            return
-
-        # Decision Tree model dosyalarını al
-        dt_models = [f for f in os.listdir(models_dir) if f.startswith("sos_dt_") and f.endswith(".pkl")]
-        # Random Forest model dosyalarını al
-        rf_models = [f for f in os.listdir(models_dir) if f.startswith("sos_rf_") and f.endswith(".pkl")]
-
-        # Decision Tree modelini yükle
-        if dt_models:
-            dt_models.sort(reverse=True)  # En yeni modeli seç
-            dt_model_path = os.path.join(models_dir, dt_models[0])
-            try:
-                with open(dt_model_path, 'rb') as f:
-                    self.dt_model = pickle.load(f)
-                print(f"Decision Tree modeli yüklendi: {dt_model_path}")
-            except Exception as e:
-                print(f"Decision Tree modeli yüklenemedi: {str(e)}")
-
-        # Random Forest modelini yükle
-        if rf_models:
-            rf_models.sort(reverse=True)  # En yeni modeli seç
-            rf_model_path = os.path.join(models_dir, rf_models[0])
-            try:
-                with open(rf_model_path, 'rb') as f:
-                    self.rf_model = pickle.load(f)
-                print(f"Random Forest modeli yüklendi: {rf_model_path}")
-            except Exception as e:
-                print(f"Random Forest modeli yüklenemedi: {str(e)}")
+        with self.model_locks[ai_type]:
+            if self.model_status[ai_type] != "yükleniyor":
+                return getattr(self, f"{ai_type}_model")  # Zaten yüklendi (ya da dosya yok)
+
+            # Eğer klasör yoksa oluştur ve kullanıcıya uyarı ver
+            if not os.path.exists(models_dir):
+                os.makedirs(models_dir, exist_ok=True)
+                print("'models' klasörü oluşturuldu. Lütfen eğitilmiş modelleri buraya yerleştirin.")
+
+            # Kayıt defterinden bu tip ve tahta boyutu için en yeni model (klasör taranmaz)
+            registry = ModelRegistry(models_dir)
+            entry = registry.lookup(ai_type, self.size)
+
+            model = None
+            status = "yok"
+            if entry is not None:
+                model_path = registry.model_path(entry)  # Düz model varsa pickle yerine o yüklenir
+                try:
+                    model = registry.load(entry)
+                    status = "yüklendi"
+                    print(f"{names[ai_type]} modeli yüklendi: {model_path}")
+                except Exception as e:
+                    status = "hata"
+                    print(f"{names[ai_type]} modeli yüklenemedi: {str(e)}")
+
+            setattr(self, f"{ai_type}_model", model)
+            self.model_status[ai_type] = status
+            # Eski modelin tahminleri geçersiz: önbellek yerinde temizlenmez, yenisiyle değiştirilir
+            # (AI iş parçacığı eski önbellekte get/put yaparken clear() çağrısı KeyError doğurur).
+            # Model önbellekten önce değiştirilir, AI tarafı önbelleği modelden önce okur: yeni
+            # önbelleği gören hesaplama yeni modeli de görür, eski model yeni önbelleğe yazamaz.
+            self.prediction_caches[ai_type] = PredictionCache()
+            return model
+
+    def model_status_text(self):
+        """Menüdeki model durumu satırı"""
+        labels = {"yükleniyor": "Yükleniyor...", "yüklendi": "Yüklendi", "yok": "Yüklenemedi", "hata": "Yüklenemedi"}
+        return (f"Decision Tree: {labels[self.model_status['dt']]} | "
+                f"Random Forest: {labels[self.model_status['rf']]}")
+
+    def refresh_model_status(self):
+        """Menüdeki model durumunu ve AI düğmelerini günceller; yükleme sürdükçe kendini yeniden planlar"""
+        if not self.model_status_label.winfo_exists():
+            return  # Menü kapandı (yeni menü kendi yoklamasını başlatır)
+
+        self.model_status_label.config(text=self.model_status_text())
+        for ai_type in ("dt", "rf"):
+            # Yüklenmekte olan model seçilebilir (start_game gerekirse bekler); bulunamayan seçilemez
+            missing = self.model_status[ai_type] != "yükleniyor" and getattr(self, f"{ai_type}_model") is None
+            self.ai_buttons[ai_type].config(state="disabled" if missing else "normal")
+
+        if "yükleniyor" in self.model_status.values():
+            self.master.after(100, self.refresh_model_status)
+
+    def get_searcher(self):
+        """İmkansız seviyenin alfa-beta araması (hamle başına süre sınırı milisaniye)"""
+        if self.searcher is None:
+            from search import AlphaBetaSearch
+            self.searcher = AlphaBetaSearch(self.size, time_limit_ms=800)
+        return self.searcher
 
     def show_main_menu(self):
+        self.cancel_ai_move()  # Bekleyen AI hamlesi menüde oynanmasın
+        self.close_mcts_player()  # Menüde MCTS süreçleri boşta beklemesin
 
         for widget in self.master.winfo_children():
             widget.destroy()
@@ -108,7 +195,7 @@ En çok puan toplayan oyuncu kazanır.
             "kolay": {"bg": "#a8e6cf", "text": "Kolay", "desc": "Yapay Zeka, rastgele ve zayıf hamleler yapar"},
             "orta": {"bg": "#fdffab", "text": "Orta", "desc": "Yapay Zeka, karışık seviyede hamleler yapar"},
             "zor": {"bg": "#ffaaa5", "text": "Zor", "desc": "Yapay Zeka, güçlü ve stratejik hamleler yapar"},
-            "imkansız": {"bg": "#ff8b94", "text": "İmkansız", "desc": "Tam kural bazlı, mükemmele yakın hamleler yapar"}
+            "imkansız": {"bg": "#ff8b94", "text": "İmkansız", "desc": "Hamleleri ileriye doğru arayarak, mükemmele yakın oynar"}
         }
 
         diff_buttons_frame = tk.Frame(diff_frame, bg="#f0f0f0")
@@ -137,27 +224,23 @@ En çok puan toplayan oyuncu kazanır.
 
         ai_styles = {
             "dt": {"bg": "#bae1ff", "text": "Decision Tree", "desc": "Karar ağacı algoritması"},
-            "rf": {"bg": "#b2fab4", "text": "Random Forest", "desc": "Rastgele orman algoritması"}
+            "rf": {"bg": "#b2fab4", "text": "Random Forest", "desc": "Rastgele orman algoritması"},
+            "mcts": {"bg": "#ffdfba", "text": "MCTS", "desc": "Monte Carlo ağaç araması (tüm çekirdeklerde)"}
         }
 
         ai_buttons_frame = tk.Frame(ai_frame, bg="#f0f0f0")
         ai_buttons_frame.pack(pady=10)
 
-        for i, ai_type in enumerate(["dt", "rf"]):
+        self.ai_buttons = {}  # Model durumu değiştikçe düğmeler refresh_model_status ile güncellenir
+        for i, ai_type in enumerate(["dt", "rf", "mcts"]):
             style = ai_styles[ai_type]
 
-            state = "normal"
-            if ai_type == "dt" and self.dt_model is None:
-                state = "disabled"
-            elif ai_type == "rf" and self.rf_model is None:
-                state = "disabled"
-
             ai_btn = tk.Radiobutton(ai_buttons_frame, text=style["text"], variable=self.ai_var,
                                    value=ai_type, font=("Arial", 12, "bold"), bg=style["bg"],
                                    selectcolor=style["bg"], indicatoron=0, width=12, height=2,
-                                   command=lambda a=ai_type: self.update_ai_desc(a),
-                                   state=state)
+                                   command=lambda a=ai_type: self.update_ai_desc(a))
             ai_btn.grid(row=0, column=i, padx=5)
+            self.ai_buttons[ai_type] = ai_btn
 
         self.ai_desc = tk.Label(ai_frame, text=ai_styles["dt"]["desc"],
                               font=("Arial", 10, "italic"), fg="#555555", bg="#f0f0f0")
@@ -167,16 +250,10 @@ En çok puan toplayan oyuncu kazanır.
         model_frame = tk.Frame(menu_frame, bg="#f0f0f0")
         model_frame.pack(pady=5)
 
-        dt_status = "Yüklendi" if self.dt_model else "Yüklenemedi"
-        dt_color = "#007700" if self.dt_model else "#cc0000"
-
-        rf_status = "Yüklendi" if self.rf_model else "Yüklenemedi"
-        rf_color = "#007700" if self.rf_model else "#cc0000"
-
-        model_status_text = f"Decision Tree: {dt_status} | Random Forest: {rf_status}"
-        model_status = tk.Label(model_frame, text=model_status_text,
-                              font=("Arial", 10), fg="#555555", bg="#f0f0f0")
-        model_status.pack(pady=5)
+        self.model_status_label = tk.Label(model_frame, text=self.model_status_text(),
+                                           font=("Arial", 10), fg="#555555", bg="#f0f0f0")
+        self.model_status_label.pack(pady=5)
+        self.refresh_model_status()  # Modeller arka planda yüklendikçe güncellenir
 
         start_button = tk.Button(menu_frame, text="OYUNU BAŞLAT", font=("Arial", 16, "bold"),
                                bg="#3a7ebf", fg="white", padx=20, pady=10, width=20, height=2,
@@ -198,7 +275,7 @@ En çok puan toplayan oyuncu kazanır.
             "kolay": {"bg": "#a8e6cf", "text": "Kolay", "desc": "Yapay Zeka, rastgele ve zayıf hamleler yapar"},
             "orta": {"bg": "#fdffab", "text": "Orta", "desc": "Yapay Zeka, karışık seviyede hamleler yapar"},
             "zor": {"bg": "#ffaaa5", "text": "Zor", "desc": "Yapay Zeka, güçlü ve stratejik hamleler yapar"},
-            "imkansız": {"bg": "#ff8b94", "text": "İmkansız", "desc": "Tam kural bazlı, mükemmele yakın hamleler yapar"}
+            "imkansız": {"bg": "#ff8b94", "text": "İmkansız", "desc": "Hamleleri ileriye doğru arayarak, mükemmele yakın oynar"}
         }
 
         self.diff_desc.config(text=diff_styles[difficulty]["desc"])
@@ -207,7 +284,8 @@ En çok puan toplayan oyuncu kazanır.
         """AI algoritması açıklamasını güncelle"""
         ai_styles = {
             "dt": {"bg": "#bae1ff", "text": "Decision Tree", "desc": "Karar ağacı algoritması"},
-            "rf": {"bg": "#b2fab4", "text": "Random Forest", "desc": "Rastgele orman algoritması"}
+            "rf": {"bg": "#b2fab4", "text": "Random Forest", "desc": "Rastgele orman algoritması"},
+            "mcts": {"bg": "#ffdfba", "text": "MCTS", "desc": "Monte Carlo ağaç araması (tüm çekirdeklerde)"}
         }
 
         self.ai_desc.config(text=ai_styles[ai_type]["desc"])
@@ -216,7 +294,7 @@ En çok puan toplayan oyuncu kazanır.
         """Eğitim seçeneklerini göster"""
         train_window = tk.Toplevel(self.master)
         train_window.title("Modelleri Yeniden Eğit")
-        train_window.geometry("400x300")
+        train_window.geometry("400x340")
         train_window.transient(self.master)
         train_window.grab_set()
 
@@ -246,6 +324,16 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         games_entry = tk.Entry(games_frame, textvariable=self.train_games_var, font=("Arial", 12),
                               width=10)
         games_entry.grid(row=0, column=1, padx=5)
+        
+        # Eğitimde kullanılacak çekirdek sayısı (-1: tüm çekirdekler)
+        jobs_label = tk.Label(games_frame, text="Çekirdek Sayısı:", font=("Arial", 12),
+                             fg="#333333", bg="#f0f0f0")
+        jobs_label.grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        
+        self.train_jobs_var = tk.IntVar(value=-1)
+        jobs_entry = tk.Entry(games_frame, textvariable=self.train_jobs_var, font=("Arial", 12),
+                             width=10)
+        jobs_entry.grid(row=1, column=1, padx=5, pady=5)
 
         buttons_frame = tk.Frame(train_frame, bg="#f0f0f0")
         buttons_frame.pack(pady=20)
@@ -263,6 +351,7 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
     def start_training(self, train_window):
         """Eğitimi başlat"""
         num_games = self.train_games_var.get()
+        n_jobs = self.train_jobs_var.get()
 
         train_window.destroy()
 
@@ -301,7 +390,7 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         def training_thread():
             try:
                 from ai_trainer import train_and_save_models
-                model_paths = train_and_save_models(5, num_games)
+                model_paths = train_and_save_models(5, num_games, n_jobs=n_jobs)
                 
                 # Eğitim tamamlandı penceresi
                 progress_window.destroy()
@@ -332,6 +421,10 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         self.total_cells = self.size * self.size
         self.filled_cells = 0
         
+        # Seçilen model arka planda henüz yüklenmediyse şimdi yükle
+        if self.ai_type in ("dt", "rf"):
+            self.load_model(self.ai_type)
+
         # Bazı AI tipleri için model kontrolleri
         if self.ai_type == "dt" and self.dt_model is None:
             messagebox.showwarning("Model Eksik", 
@@ -344,6 +437,8 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
             return
         
         self.board = [[' ' for _ in range(self.size)] for _ in range(self.size)]
+        self.threats = ThreatIndex(self.size)  # SOS tamamlayan hamlelerin indeksi
+        self.board_key = 0  # Boş tahtanın anahtarı
         self.current_player = 1  # İnsan her zaman başlar
         self.scores = {1: 0, 2: 0}
         self.last_move = None
@@ -374,7 +469,8 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         # Ayarlar bilgisi
         ai_desc = {
             "dt": "Decision Tree",
-            "rf": "Random Forest"
+            "rf": "Random Forest",
+            "mcts": "MCTS"
         }
         
         settings_text = f"Tahta: 5x5 | Zorluk: {self.difficulty.title()} | AI: {ai_desc[self.ai_type]}"
@@ -511,12 +607,14 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         
         letter = self.selected_letter.get()
         self.board[row][col] = letter
+        self.threats.place(row, col, letter)  # Tehdit indeksini güncelle
+        self.board_key ^= self.hasher.move_key(row, col, letter)  # Zobrist anahtarını güncelle
         self.buttons[row][col].config(text=letter, bg="#e6f2ff", fg="#3a7ebf", state="disabled")
         self.filled_cells += 1
         self.last_move = (row, col)
         
-        # SOS kontrolü
-        sos_formed = self.check_sos(row, col)
+        # SOS kontrolü (tamamlanan SOS'lar sadece oynanan hamle için vurgulanır)
+        sos_formed = self.resolve_sos(row, col)
         self.last_sos_formed = sos_formed
         
         if sos_formed:
@@ -527,7 +625,7 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
             self.current_player = 2  # AI's turn
             self.move_info_label.config(text="AI düşünüyor...", fg="#555555")
             self.master.update()
-            self.master.after(1000, self.ai_move)  # 1 saniye sonra AI hamlesi
+            self.ai_move(1000)  # AI hamlesi en erken 1 saniye sonra (hesaplama süresi dahil)
         
         # Kazanma olasılıklarını güncelle
         self.update_win_probabilities()
@@ -578,44 +676,15 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         self.ai_prob_value.config(text=f"{ai_prob:.1%}")
     
     def check_sos(self, row, col):
-        """SOS oluşup oluşmadığını kontrol et"""
-        letter = self.board[row][col]
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # Yatay, dikey ve çaprazlar
-        
-        sos_formed = False
-        
-        if letter == 'S':
-            # Bu S bir SOS'un başlangıcı mı?
-            for dr, dc in directions:
-                if (0 <= row + 2*dr < self.size and 
-                    0 <= col + 2*dc < self.size and
-                    self.board[row + dr][col + dc] == 'O' and
-                    self.board[row + 2*dr][col + 2*dc] == 'S'):
-                    sos_formed = True
-                    self.highlight_sos(row, col, dr, dc)
-            
-            # Bu S bir SOS'un sonu mu?
-            for dr, dc in directions:
-                if (0 <= row - 2*dr < self.size and 
-                    0 <= col - 2*dc < self.size and
-                    self.board[row - dr][col - dc] == 'O' and
-                    self.board[row - 2*dr][col - 2*dc] == 'S'):
-                    sos_formed = True
-                    self.highlight_sos(row - 2*dr, col - 2*dc, dr, dc)
-                    
-        elif letter == 'O':
-            # Bu O bir SOS'un ortası mı?
-            for dr, dc in directions:
-                if (0 <= row - dr < self.size and 
-                    0 <= col - dc < self.size and
-                    0 <= row + dr < self.size and 
-                    0 <= col + dc < self.size and
-                    self.board[row - dr][col - dc] == 'S' and
-                    self.board[row + dr][col + dc] == 'S'):
-                    sos_formed = True
-                    self.highlight_sos(row - dr, col - dc, dr, dc)
-        
-        return sos_formed
+        """(row, col) hücresindeki harf bir SOS tamamlıyor mu? (yan etkisiz, vurgulama yapmaz)"""
+        return bool(completed_lines(self.board, row, col, self.board[row][col]))
+
+    def resolve_sos(self, row, col):
+        """Oynanan hamlenin tamamladığı SOS'ları vurgular; SOS oluştuysa True döndürür"""
+        sos_lines = completed_lines(self.board, row, col, self.board[row][col])
+        for sr, sc, dr, dc in sos_lines:
+            self.highlight_sos(sr, sc, dr, dc)
+        return bool(sos_lines)
     
     def highlight_sos(self, start_row, start_col, dr, dc):
         """SOS'u vurgula"""
@@ -628,8 +697,8 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
             self.buttons[r][c].config(bg=colors[self.current_player])
             
             # 0.5 saniye sonra orijinal rengine döndür
-            self.master.after(500, lambda row=r, cow=c, player=self.current_player:
-                             self.reset_highlight(r, c, player))
+            self.master.after(500, lambda row=r, col=c, player=self.current_player:
+                             self.reset_highlight(row, col, player))
     
     def reset_highlight(self, row, col, player):
         """Vurgulamayı kaldır"""
@@ -638,18 +707,91 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         
         self.buttons[row][col].config(bg=colors[player])
     
-    def ai_move(self):
-        """AI hamlesini yap"""
+    def ai_move(self, delay_ms=1000):
+        """AI hamlesini arka planda hesaplatır; hamle en erken delay_ms sonra tahtaya konur
+
+        Hesaplama süresi bekleme süresinin içinde sayılır; arayüz hesaplama sırasında donmaz.
+        """
         if not self.game_started or self.filled_cells == self.total_cells:
             return
-        
-        # Zorluk seviyesine göre AI hamlesini belirle
+
+        self.ai_generation += 1
+        self.ai_requests.put(self.ai_generation)
+        self.master.after(AI_POLL_MS, self.poll_ai_move, self.ai_generation, time.perf_counter(), delay_ms)
+
+    def cancel_ai_move(self):
+        """Bekleyen AI hamlesini iptal eder (sonucu gelse de oynanmaz)
+
+        Nesil değiştiği için sürmekte olan alfa-beta ve MCTS aramaları da ilk kontrollerinde durur
+        (bkz. choose_ai_move); henüz başlamamış bir arama hiç çalışmaz.
+        """
+        self.ai_generation += 1
+
+    def close_mcts_player(self):
+        """MCTS süreç havuzunu kapatır (oyuncu korunur, sonraki MCTS hamlesinde havuz yeniden açılır)"""
+        if self.mcts_player is not None:
+            self.mcts_player.close()
+
+    def close_window(self):
+        """Pencere kapatılırken bekleyen AI hamlesini iptal eder ve MCTS süreçlerini kapatır"""
+        self.cancel_ai_move()
+        self.close_mcts_player()
+        self.master.destroy()
+
+    def ai_worker(self):
+        """Arka plan iş parçacığı: istekleri sırayla hesaplayıp sonuç kuyruğuna yazar (Tk'ye dokunmaz)"""
+        while True:
+            generation = self.ai_requests.get()
+            if generation != self.ai_generation:
+                continue  # Hesaplanmadan iptal edildi
+
+            try:
+                move = self.choose_ai_move(generation)
+            except Exception as e:
+                print(f"AI hamlesi hesaplanırken hata: {str(e)}")
+                move = None
+            self.ai_results.put((generation, move))
+
+    def poll_ai_move(self, generation, started, delay_ms):
+        """Sonuç kuyruğunu yoklar; hamle geldiyse bekleme süresinin kalanında oynar"""
+        if generation != self.ai_generation:
+            return  # İstek iptal edildi
+
+        while True:
+            try:
+                result_generation, move = self.ai_results.get_nowait()
+            except queue.Empty:
+                self.master.after(AI_POLL_MS, self.poll_ai_move, generation, started, delay_ms)
+                return
+            if result_generation == generation:
+                break  # Eski isteklerin sonuçları atlanır
+
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        self.master.after(max(0, delay_ms - elapsed_ms), self.play_ai_move, generation, move)
+
+    def choose_ai_move(self, generation=None):
+        """Zorluk seviyesine ve AI tipine göre hamleyi (row, col, letter) seçer (arka planda çalışır)
+
+        generation verilirse istek iptal edildiğinde (nesil değişince) uzun aramalar erken kesilir.
+        """
+        def cancelled():
+            return generation is not None and generation != self.ai_generation
+
         if self.difficulty == "imkansız":
-            # İmkansız zorluk seviyesi her zaman kural bazlı çalışsın
-            row, col, letter = self.rule_based_move_hard()
+            # İmkansız zorluk seviyesi her zaman süre sınırlı alfa-beta araması ile oynasın
+            # (açılış kitabı zor seviyenin hamlelerini tutar; aramanın yerine kullanılmaz)
+            row, col, letter = self.get_searcher().search(self.board, should_stop=cancelled)
         else:
             # Diğer zorluk seviyeleri için seçilen modeli kullan
-            if self.ai_type == "dt":
+            if self.ai_type == "mcts":
+                # Zorluk seviyesine göre MCTS kullanım oranını ayarla
+                if self.difficulty == "kolay" and random.random() < 0.7:
+                    row, col, letter = self.rule_based_move_easy()
+                elif self.difficulty == "orta" and random.random() < 0.4:
+                    row, col, letter = self.rule_based_move_medium()
+                else:
+                    row, col, letter = self.mcts_move(cancelled)
+            elif self.ai_type == "dt":
                 if self.dt_model is None:
                     # Model yoksa kural bazlı kullan
                     row, col, letter = self.rule_based_move(self.difficulty)
@@ -660,7 +802,8 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
                     elif self.difficulty == "orta" and random.random() < 0.4:
                         row, col, letter = self.rule_based_move_medium()
                     else:
-                        row, col, letter = self.model_based_move(self.dt_model)
+                        cache = self.prediction_caches["dt"]  # Modelden önce okunur (bkz. load_model)
+                        row, col, letter = self.model_based_move(self.dt_model, cache)
             else:  # "rf"
                 if self.rf_model is None:
                     # Model yoksa kural bazlı kullan
@@ -672,17 +815,31 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
                     elif self.difficulty == "orta" and random.random() < 0.4:
                         row, col, letter = self.rule_based_move_medium()
                     else:
-                        row, col, letter = self.model_based_move(self.rf_model)
-        
+                        cache = self.prediction_caches["rf"]  # Modelden önce okunur (bkz. load_model)
+                        row, col, letter = self.model_based_move(self.rf_model, cache)
+
+        return row, col, letter
+
+    def play_ai_move(self, generation, move):
+        """Hesaplanan AI hamlesini tahtaya koyar (Tk iş parçacığında)"""
+        if generation != self.ai_generation or not self.game_started:
+            return  # İstek iptal edildi ya da oyun bitti
+
+        if move is None:
+            move = self.rule_based_move_easy()  # Hesaplama hata verdiyse rastgele hamle
+        row, col, letter = move
+
         # Hamleyi yap
         if row is not None and col is not None and letter is not None:
             self.board[row][col] = letter
+            self.threats.place(row, col, letter)  # Tehdit indeksini güncelle
+            self.board_key ^= self.hasher.move_key(row, col, letter)  # Zobrist anahtarını güncelle
             self.buttons[row][col].config(text=letter, bg="#ffe6e6", fg="#bf3a3a", state="disabled")
             self.filled_cells += 1
             self.last_move = (row, col)
             
-            # SOS kontrolü
-            sos_formed = self.check_sos(row, col)
+            # SOS kontrolü (tamamlanan SOS'lar sadece oynanan hamle için vurgulanır)
+            sos_formed = self.resolve_sos(row, col)
             self.last_sos_formed = sos_formed
             
             if sos_formed:
@@ -690,8 +847,8 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
                 self.ai_score_label.config(text=str(self.scores[2]))
                 self.move_info_label.config(text=f"AI bir SOS oluşturdu! Ekstra hamle kazandı.", fg="#990000")
                 
-                # AI tekrar hamle yapar
-                self.master.after(1500, self.ai_move)
+                # AI tekrar hamle yapar (en erken 1.5 saniye sonra, hesaplama süresi dahil)
+                self.ai_move(1500)
             else:
                 self.current_player = 1  # İnsanın sırası
                 self.move_info_label.config(text="Sizin sıranız. Bir hücre seçin ve S veya O yerleştirin.", fg="#3a7ebf")
@@ -703,6 +860,18 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
             if self.filled_cells == self.total_cells:
                 self.game_over()
     
+    def mcts_move(self, should_stop=None):
+        """Monte Carlo ağaç araması ile hamle yapar (ağaçlar ayrı süreçlerde aranır)"""
+        if self.mcts_player is None:
+            from mcts import MCTSPlayer
+            self.mcts_player = MCTSPlayer(time_limit_ms=1000)
+
+        move = self.mcts_player.choose_move(self.board, self.current_player, self.scores,
+                                            should_stop=should_stop)
+        if move is None:
+            return self.rule_based_move_easy()
+        return move
+
     def rule_based_move(self, difficulty=None):
         """Kural bazlı bir hamle yap"""
         if difficulty is None:
@@ -742,22 +911,10 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
     def rule_based_move_medium(self):
         """Orta seviye için yarı akıllı hamle yap"""
         # 1. Önce SOS oluşturabileceğimiz bir hamle var mı kontrol et
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == ' ':
-                    # S ile SOS oluşturabilir miyiz?
-                    self.board[i][j] = 'S'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Tahtayı geri al
-                        return i, j, 'S'
-                    
-                    # O ile SOS oluşturabilir miyiz?
-                    self.board[i][j] = 'O'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Tahtayı geri al
-                        return i, j, 'O'
-                    
-                    self.board[i][j] = ' '  # Tahtayı geri al
+        # (tahtaya harf koyup denemek yerine tehdit indeksinden satır sırasıyla ilk SOS tamamlayan hamle)
+        winning_move = self.threats.first_threat()
+        if winning_move:
+            return winning_move
         
         # 2. Basit hamle yap
         for i in range(self.size):
@@ -772,50 +929,30 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
     
     def rule_based_move_hard(self):
         """Zor seviye için akıllı hamle yap"""
+        # 0. Açılıştaysak kitaptaki hamleyi, oyun sonu tablosu varsa kesin en iyi hamleyi oyna
+        from opening_book import get_opening_book
+        from tablebase import get_tablebase
+        book = get_opening_book(self.size)
+        if book is not None and self.filled_cells <= book.max_plies:
+            book_move = book.lookup(self.board)
+            if book_move:
+                return book_move
+
+        tablebase = get_tablebase(self.size)
+        if tablebase is not None and self.total_cells - self.filled_cells <= tablebase.max_empty:
+            table_move = tablebase.best_move(self.board)
+            if table_move:
+                return table_move
+
         # 1. Önce SOS oluşturabileceğimiz bir hamle var mı kontrol et
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == ' ':
-                    # S ile SOS oluşturabilir miyiz?
-                    self.board[i][j] = 'S'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Tahtayı geri al
-                        return i, j, 'S'
-                    
-                    # O ile SOS oluşturabilir miyiz?
-                    self.board[i][j] = 'O'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Tahtayı geri al
-                        return i, j, 'O'
-                    
-                    self.board[i][j] = ' '  # Tahtayı geri al
+        # (tehdit indeksinden satır sırasıyla ilk SOS tamamlayan hamle)
+        winning_move = self.threats.first_threat()
+        if winning_move:
+            return winning_move
         
         # 2. Rakibin SOS oluşturmasını engelleyecek bir hamle var mı kontrol et
-        original_player = self.current_player
-        opponent = 1  # İnsan
-        
-        self.current_player = opponent  # Geçici olarak rakibin sırası
-        
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == ' ':
-                    # Rakip S ile SOS oluşturabilir mi?
-                    self.board[i][j] = 'S'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Tahtayı geri al
-                        self.current_player = original_player  # Oyuncuyu geri al
-                        return i, j, 'S'
-                    
-                    # Rakip O ile SOS oluşturabilir mi?
-                    self.board[i][j] = 'O'
-                    if self.check_sos(i, j):
-                        self.board[i][j] = ' '  # Tahtayı geri al
-                        self.current_player = original_player  # Oyuncuyu geri al
-                        return i, j, 'O'
-                    
-                    self.board[i][j] = ' '  # Tahtayı geri al
-        
-        self.current_player = original_player  # Oyuncuyu geri al
+        # SOS oluşumu oyuncuya bağlı olmadığından rakibin tamamlayabileceği hamleler
+        # aynı indekstedir; indeks boşsa engellenecek bir hamle de yoktur.
         
         # 3. Stratejik hamle yap
         strategic_moves = []
@@ -840,117 +977,57 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
     
     def check_letter_potential(self, row, col, letter):
         """Bir harfin potansiyel SOS oluşturma ihtimalini kontrol et"""
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+        board = self.board
         
-        if letter == 'O':
-            for dr, dc in directions:
+        for role, r1, c1, r2, c2, _ in get_sos_lines(self.size)[row][col]:
+            if letter == 'O' and role == SOS_MIDDLE:
                 # S-O-? durumu
-                if (0 <= row - dr < self.size and 0 <= col - dc < self.size and
-                    0 <= row + dr < self.size and 0 <= col + dc < self.size and
-                    self.board[row - dr][col - dc] == 'S' and self.board[row + dr][col + dc] == ' '):
+                if board[r1][c1] == 'S' and board[r2][c2] == ' ':
                     return True
                 
                 # ?-O-S durumu
-                if (0 <= row - dr < self.size and 0 <= col - dc < self.size and
-                    0 <= row + dr < self.size and 0 <= col + dc < self.size and
-                    self.board[row - dr][col - dc] == ' ' and self.board[row + dr][col + dc] == 'S'):
+                if board[r1][c1] == ' ' and board[r2][c2] == 'S':
                     return True
-        
-        elif letter == 'S':
-            for dr, dc in directions:
-                if (0 <= row + 2*dr < self.size and 0 <= col + 2*dc < self.size and
-                    self.board[row + dr][col + dc] == ' ' and self.board[row + 2*dr][col + 2*dc] == ' '):
-                    return True
-                
-                if (0 <= row - 2*dr < self.size and 0 <= col - 2*dc < self.size and
-                    self.board[row - dr][col - dc] == ' ' and self.board[row - 2*dr][col - 2*dc] == ' '):
+            
+            elif letter == 'S' and role != SOS_MIDDLE:
+                # S-?-? durumu (ortadaki ve uçtaki hücre boş)
+                if board[r1][c1] == ' ' and board[r2][c2] == ' ':
                     return True
         
         return False
     
     def evaluate_move(self, row, col, letter):
         """Bir hamlenin stratejik değerini hesapla"""
-        score = 0
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        
-        if letter == 'S':
-            for dr, dc in directions:
-                if (0 <= row + 2*dr < self.size and 0 <= col + 2*dc < self.size):
-                    if self.board[row + dr][col + dc] == 'O' and self.board[row + 2*dr][col + 2*dc] == ' ':
-                        score += 3  # Potansiyel SOS
-                    elif self.board[row + dr][col + dc] == ' ' and self.board[row + 2*dr][col + 2*dc] == 'S':
-                        score += 2  # S-?-S durumu
-                    elif self.board[row + dr][col + dc] == ' ' and self.board[row + 2*dr][col + 2*dc] == ' ':
-                        score += 1  # Başlangıç
-                
-                if (0 <= row - 2*dr < self.size and 0 <= col - 2*dc < self.size):
-                    if self.board[row - dr][col - dc] == 'O' and self.board[row - 2*dr][col - 2*dc] == ' ':
-                        score += 3  # Potansiyel SOS
-                    elif self.board[row - dr][col - dc] == ' ' and self.board[row - 2*dr][col - 2*dc] == 'S':
-                        score += 2  # S-?-S durumu
-                    elif self.board[row - dr][col - dc] == ' ' and self.board[row - 2*dr][col - 2*dc] == ' ':
-                        score += 1  # Başlangıç
-        
-        elif letter == 'O':
-            for dr, dc in directions:
-                # ?-O-? durumu
-                if (0 <= row - dr < self.size and 0 <= col - dc < self.size and
-                    0 <= row + dr < self.size and 0 <= col + dc < self.size):
-                    if self.board[row - dr][col - dc] == 'S' and self.board[row + dr][col + dc] == 'S':
-                        score += 10  # Kesin SOS
-                    elif self.board[row - dr][col - dc] == 'S' and self.board[row + dr][col + dc] == ' ':
-                        score += 3  # S-O-? durumu
-                    elif self.board[row - dr][col - dc] == ' ' and self.board[row + dr][col + dc] == 'S':
-                        score += 3  # ?-O-S durumu
-                    elif self.board[row - dr][col - dc] == ' ' and self.board[row + dr][col + dc] == ' ':
-                        score += 1  # Başlangıç
-        
-        original_player = self.current_player
-        opponent = 1  # İnsan
-        
-        self.current_player = opponent
-        self.board[row][col] = letter
-        
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == ' ':
-                    self.board[i][j] = 'S'
-                    if self.check_sos(i, j):
-                        score -= 5  
-                    self.board[i][j] = ' '
-                    
-                    self.board[i][j] = 'O'
-                    if self.check_sos(i, j):
-                        score -= 5  
-                    self.board[i][j] = ' '
-        
-        self.board[row][col] = ' '
-        self.current_player = original_player
-        
-        return score
+        # Puanlama alfa-beta aramasının hamle sıralamasıyla ortaktır (tahta = tehdit indeksinin tahtası)
+        from search import evaluate_move
+        return evaluate_move(self.threats, row, col, letter)
 
-    def model_based_move(self, model):
-        """Eğitilmiş makine öğrenmesi modelini kullanarak hamle yapar"""
+    def model_based_move(self, model, cache=None):
+        """Eğitilmiş makine öğrenmesi modelini kullanarak hamle yapar
+
+        Model tek bir predict_proba çağrısıyla sorgulanır ve en olası yasal hamle oynanır.
+        cache verilirse (bu modele ait PredictionCache) daha önce sorulan tahtalarda özellik
+        çıkarımı ve tahmin atlanır; anahtar tahtanın Zobrist anahtarıdır.
+        """
 
         # Eğer model None ise, kural tabanlı hamle yap
         if model is None:
             return self.rule_based_move()
 
-        # Mevcut tahta durumundan özellikler çıkar
-        features = self.extract_features()# tahtayı vektöre çevirir
-
         try:
-            # Modeli kullanarak tahmin yap; model.predict girdi olarak liste bekler
-            move_str = model.predict([features])[0]# en uygun hamleyi verir
-
-            # Tahmin sonucu "satır,sütun,harf" şeklinde string döner, parçala
-            row, col, letter = move_str.split(",")
-
-            # Satır ve sütun indekslerini tam sayıya çevir
-            row, col = int(row), int(col)
-
-            # Eğer önerilen hücre boş değilse (daha önce doluysa)
-            if self.board[row][col] != ' ':
+            # Tahta ve anahtarı bir kez okunur: hesaplama sürerken Tk iş parçacığı oyunu yeniden
+            # başlatırsa (yeni tahta ve anahtar) bir tahtanın hamlesi diğerinin anahtarına yazılmaz
+            board = self.board
+            key = self.board_key
+            prediction = cache.get(key) if cache is not None else None
+            if prediction is None:
+                moves = self.model_top_moves(model, 1)
+                prediction = moves[0] if moves else ()  # (): model bu tahtada yasal hamle önermiyor
+                if cache is not None and self.board is board and self.board_key == key:
+                    cache.put(key, prediction)
+
+            # Modelin bildiği hamlelerin hepsi doluysa (nadir)
+            if not prediction:
                 # Zorluk seviyesine göre kural tabanlı kolay, orta veya zor hamle yap
                 if self.difficulty == "kolay":
                     return self.rule_based_move_easy()
@@ -959,21 +1036,59 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
                 else:
                     return self.rule_based_move_hard()
 
-            # Eğer hücre boşsa tahmin edilen hamleyi döndür
-            return row, col, letter
+            # Tahmin edilen yasal hamleyi döndür
+            return prediction
 
         except Exception as e:
             # Tahmin sırasında hata olursa hata mesajını yazdır ve kural tabanlı hamle yap
             print(f"Model tahmininde hata: {str(e)}")
             return self.rule_based_move()
 
-    def extract_features(self):#tahtayı vektöre çevirir
-        """Tahtadaki hücre durumlarına göre model için özellik vektörü oluşturur"""
+    def model_top_moves(self, model, k=1):
+        """Modelin mevcut tahta için önerdiği en olası k yasal hamle [(row, col, letter), ...]
+
+        predict_proba bir kez çağrılır; dolu hücrelere düşen ve olasılığı sıfır olan sınıflar
+        elenir. Sıralama olasılığa göre azalandır (eşitlikte sınıf sırası, predict ile aynı).
+        """
+        # Kanonik tahtalarla eğitilmiş model tahtanın kanonik simetrisiyle sorgulanır
+        canonical = getattr(model, "canonical_symmetry", False)
+        if canonical:
+            from symmetry import canonical_board, original_cell
+            board, transform = canonical_board(self.board)
+        else:
+            board = self.board
+
+        # Mevcut tahta durumundan özellikler çıkar
+        features = self.extract_features(board)# tahtayı vektöre çevirir
+
+        # Her sınıfın olasılığı; model.predict_proba girdi olarak liste bekler
+        proba = model.predict_proba([features])[0]
+
+        # Sınıf etiketlerinin hamle hali (model yüklenirken bir kez ayrıştırılır, bkz. FlatTreeModel)
+        class_moves = model.class_moves
+
+        # Yasal hamleleri olasılığa göre sırala (sıralama kararlı: eşitlikte önceki sınıf önde)
+        legal = [i for i, (row, col, _) in enumerate(class_moves) if board[row][col] == ' ' and proba[i] > 0]
+        legal.sort(key=lambda i: -proba[i])
+
+        moves = []
+        for i in legal[:k]:
+            row, col, letter = class_moves[i]
+            # Kanonik tahtadaki hamleyi asıl tahtaya geri eşle
+            if canonical:
+                row, col = original_cell(row, col, transform, self.size)
+            moves.append((row, col, letter))
+        return moves
+
+    def extract_features(self, board=None):#tahtayı vektöre çevirir
+        """Tahtadaki hücre durumlarına göre model için özellik vektörü oluşturur (varsayılan: oyun tahtası)"""
+        if board is None:
+            board = self.board
 
         features = []  # Özellikleri tutacak liste
 
         # Tahtadaki her hücre için
-        for row in self.board:
+        for row in board:
             for cell in row:
                 # Hücre boşsa 0 ekle
                 if cell == " ":
@@ -1000,53 +1115,51 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         features.append(empty_count)
 
         # SOS oluşturma potansiyellerini hesapla ve listeye ekle
-        sos_potentials = self.count_sos_potentials()
+        sos_potentials = self.count_sos_potentials(board)
         features.extend(sos_potentials)
 
         # Özellik vektörünü döndür
         return features
 
-    def count_sos_potentials(self):
-        """SOS oluşturma potansiyellerini sayar"""
+    def count_sos_potentials(self, board=None):
+        """SOS oluşturma potansiyellerini sayar (varsayılan: oyun tahtası)"""
+        if board is None:
+            board = self.board
 
         potentials = [0, 0]  # Şu an sadece bir oyuncu için kullanılıyor (potentials[0])
 
-        # Kontrol edilecek 4 yön: sağa, aşağıya, sağ-alt çapraz, sol-alt çapraz
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+        # Her hücrenin ait olduğu SOS üçlüleri (boyut başına bir kez hesaplanır)
+        lines = get_sos_lines(self.size)
 
         # Tüm hücreleri kontrol et
         for i in range(self.size):
             for j in range(self.size):
-                # Eğer hücrede 'S' varsa, olası SOS dizileri kontrol edilir
-                if self.board[i][j] == "S":
-                    for dr, dc in directions:
+                cell = board[i][j]
+                if cell == " ":
+                    continue
+
+                for role, r1, c1, r2, c2, _ in lines[i][j]:
+                    first = board[r1][c1]
+                    second = board[r2][c2]
+
+                    # Eğer hücrede 'S' varsa ve üçlünün başındaysa
+                    if cell == "S" and role == SOS_START:
                         # Şekil: S - O - boş (tamamlanabilir SOS)
-                        if (0 <= i + 2 * dr < self.size and 0 <= j + 2 * dc < self.size and
-                                self.board[i + dr][j + dc] == "O" and
-                                self.board[i + 2 * dr][j + 2 * dc] == " "):
+                        if first == "O" and second == " ":
                             potentials[0] += 1
 
                         # Şekil: S - boş - S (tamamlanabilir SOS)
-                        if (0 <= i + 2 * dr < self.size and 0 <= j + 2 * dc < self.size and
-                                self.board[i + dr][j + dc] == " " and
-                                self.board[i + 2 * dr][j + 2 * dc] == "S"):
+                        if first == " " and second == "S":
                             potentials[0] += 1
 
-                # Eğer hücrede 'O' varsa, çevresine bakılır
-                elif self.board[i][j] == "O":
-                    for dr, dc in directions:
+                    # Eğer hücrede 'O' varsa ve üçlünün ortasındaysa
+                    elif cell == "O" and role == SOS_MIDDLE:
                         # Şekil: S - O - boş (S sağdan gelebilir)
-                        if (0 <= i - dr < self.size and 0 <= j - dc < self.size and
-                                0 <= i + dr < self.size and 0 <= j + dc < self.size and
-                                self.board[i - dr][j - dc] == "S" and
-                                self.board[i + dr][j + dc] == " "):
+                        if first == "S" and second == " ":
                             potentials[0] += 1
 
                         # Şekil: boş - O - S (S soldan gelebilir)
-                        if (0 <= i - dr < self.size and 0 <= j - dc < self.size and
-                                0 <= i + dr < self.size and 0 <= j + dc < self.size and
-                                self.board[i - dr][j - dc] == " " and
-                                self.board[i + dr][j + dc] == "S"):
+                        if first == " " and second == "S":
                             potentials[0] += 1
 
         return potentials  # Potansiyel sayısını döndür
@@ -1101,7 +1214,8 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
         # AI tipi açıklaması
         ai_desc = {
             "dt": "Decision Tree",
-            "rf": "Random Forest"
+            "rf": "Random Forest",
+            "mcts": "MCTS"
         }
 
         # Seçilen ayarları göster
@@ -1128,9 +1242,12 @@ ve yapay zeka modellerini eğitecektir. Bu işlem birkaç dakika sürebilir.
 
     def restart_game(self):
         """Aynı ayarlarla oyunu yeniden başlatır"""
+        self.cancel_ai_move()  # Önceki oyunun bekleyen AI hamlesi yeni tahtaya konmasın
 
         # Tahtayı sıfırla
         self.board = [[' ' for _ in range(self.size)] for _ in range(self.size)]
+        self.threats = ThreatIndex(self.size)  # Tehdit indeksini sıfırla
+        self.board_key = 0  # Zobrist anahtarını sıfırla
         self.current_player = 1  # Sıra insan oyuncuda
         self.scores = {1: 0, 2: 0}  # Skorları sıfırla
         self.last_move = None  # Son hamleyi temizle
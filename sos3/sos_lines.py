@@ -0,0 +1,62 @@
+# Bir hücrenin SOS üçlüsündeki rolü
+SOS_START = 0  # Üçlünün başındaki S
+SOS_MIDDLE = 1  # Üçlünün ortasındaki O
+SOS_END = 2  # Üçlünün sonundaki S
+
+# SOS desenlerini kontrol etmek için 4 yön: sağ, aşağı, sağ alt çapraz, sol alt çapraz
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+# Tahta boyutuna göre hesaplanmış çizgi tablolarını tutan önbellek
+_LINE_CACHE = {}
+
+
+def get_sos_lines(size):
+    """Her hücrenin içinde bulunduğu tüm SOS üçlülerini listeleyen tabloyu (boyut başına bir kez) döndürür
+
+    table[r][c] içindeki her kayıt (rol, r1, c1, r2, c2, çizgi) biçimindedir:
+    - SOS_START / SOS_END: (r1, c1) ortadaki O hücresi, (r2, c2) diğer uçtaki S hücresi
+    - SOS_MIDDLE: (r1, c1) baştaki S hücresi, (r2, c2) sondaki S hücresi
+    çizgi ise üçlünün başlangıç hücresi ve yönüdür: (satır, sütun, dr, dc)
+    """
+    if size in _LINE_CACHE:
+        return _LINE_CACHE[size]
+
+    table = [[[] for _ in range(size)] for _ in range(size)]
+
+    for dr, dc in DIRECTIONS:
+        for r in range(size):
+            for c in range(size):
+                # Üçlü tahtanın dışına taşıyorsa atla
+                if not (0 <= r + 2 * dr < size and 0 <= c + 2 * dc < size):
+                    continue
+
+                mr, mc = r + dr, c + dc  # Ortadaki hücre
+                er, ec = r + 2 * dr, c + 2 * dc  # Sondaki hücre
+                line = (r, c, dr, dc)
+
+                table[r][c].append((SOS_START, mr, mc, er, ec, line))
+                table[mr][mc].append((SOS_MIDDLE, r, c, er, ec, line))
+                table[er][ec].append((SOS_END, mr, mc, r, c, line))
+
+    # Tabloyu değiştirilemez hale getir ve önbelleğe koy
+    table = tuple(tuple(tuple(cell) for cell in row) for row in table)
+    _LINE_CACHE[size] = table
+    return table
+
+
+def completed_lines(board, row, col, letter):
+    """(row, col) hücresine letter konursa tamamlanan SOS üçlülerinin çizgilerini döndürür
+
+    Tahtayı değiştirmez ve hücrenin kendi içeriğine bakmaz: hamle oynanmadan önce (varsayımsal
+    hamle) ya da oynandıktan sonra aynı sonucu verir. Tamamlanan SOS sayısı listenin uzunluğudur.
+    """
+    completed = []
+    for role, r1, c1, r2, c2, line in get_sos_lines(len(board))[row][col]:
+        if role == SOS_MIDDLE:
+            # O, iki yanında S varsa SOS'un ortasını tamamlar
+            if letter == 'O' and board[r1][c1] == 'S' and board[r2][c2] == 'S':
+                completed.append(line)
+        # S, ortada O ve diğer uçta S varsa SOS'un başını ya da sonunu tamamlar
+        elif letter == 'S' and board[r1][c1] == 'O' and board[r2][c2] == 'S':
+            completed.append(line)
+    return completed
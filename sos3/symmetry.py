@@ -0,0 +1,95 @@
+import numpy as np  # Tahtaları toplu halde dönüştürmek için
+
+
+# Kare tahtanın 8 simetrisi: (satır, sütun) -> yeni (satır, sütun), n = size - 1
+TRANSFORMS = (
+    lambda r, c, n: (r, c),  # Kimlik
+    lambda r, c, n: (c, n - r),  # 90° döndürme
+    lambda r, c, n: (n - r, n - c),  # 180° döndürme
+    lambda r, c, n: (n - c, r),  # 270° döndürme
+    lambda r, c, n: (r, n - c),  # Yatay ayna
+    lambda r, c, n: (n - r, c),  # Dikey ayna
+    lambda r, c, n: (c, r),  # Ana köşegen aynası
+    lambda r, c, n: (n - c, n - r),  # Yan köşegen aynası
+)
+
+# Tahta boyutuna göre hesaplanmış simetri tablolarını tutan önbellek
+_SYMMETRY_CACHE = {}
+
+
+def get_symmetry_tables(size):
+    """Her simetri için hücre eşlemelerini (bir kez) hesaplar
+
+    cell_maps[t, hücre]: hücrenin t dönüşümünden sonraki indeksi
+    gathers[t, yeni hücre]: dönüşmüş tahtanın o hücresine gelen eski hücre (ters eşleme)
+    """
+    if size in _SYMMETRY_CACHE:
+        return _SYMMETRY_CACHE[size]
+
+    total_cells = size * size
+    cell_maps = np.empty((len(TRANSFORMS), total_cells), dtype=np.intp)
+    for t, transform in enumerate(TRANSFORMS):
+        for cell in range(total_cells):
+            r, c = transform(cell // size, cell % size, size - 1)
+            cell_maps[t, cell] = r * size + c
+
+    tables = {
+        "cell_maps": cell_maps,
+        "gathers": np.argsort(cell_maps, axis=1),  # Permütasyonun tersi
+    }
+    _SYMMETRY_CACHE[size] = tables
+    return tables
+
+
+def canonicalize_boards(boards):
+    """(N, size, size) ya da (N, size*size) int8 tahtaları kanonik temsilcilerine çevirir
+
+    Kanonik tahta 8 simetriden düz hücre dizisi sözlük sırasıyla en küçük olanıdır.
+    (kanonik tahtalar aynı biçimde, her tahtaya uygulanan dönüşüm numarası) döndürür.
+    """
+    boards = np.asarray(boards, dtype=np.int8)
+    num_boards = boards.shape[0]
+    size = boards.shape[1] if boards.ndim == 3 else int(round(boards.shape[1] ** 0.5))
+    gathers = get_symmetry_tables(size)["gathers"]
+
+    flat = boards.reshape(num_boards, size * size)
+    variants = flat[:, gathers]  # (N, 8, hücre): her tahtanın 8 simetrisi
+
+    # Sözlük sırası: hücreleri sırayla gez, en küçük değeri taşımayan dönüşümleri ele
+    candidates = np.ones((num_boards, len(TRANSFORMS)), dtype=bool)
+    for cell in range(size * size):
+        column = np.where(candidates, variants[:, :, cell], np.int8(127))
+        candidates &= column == column.min(axis=1, keepdims=True)
+
+    transforms = candidates.argmax(axis=1)  # Eşitlikte (simetrik tahta) ilk dönüşüm
+    canonical = variants[np.arange(num_boards), transforms]
+
+    return canonical.reshape(boards.shape), transforms
+
+
+def canonical_cells(cells, transforms, size):
+    """Hücre indekslerini (ör. hamle etiketleri) tahtaların dönüşümleriyle eşler"""
+    return get_symmetry_tables(size)["cell_maps"][transforms, cells]
+
+
+def original_cell(row, col, transform, size):
+    """Kanonik tahtadaki (row, col) hücresinin asıl tahtadaki karşılığı"""
+    cell = get_symmetry_tables(size)["gathers"][transform, row * size + col]
+    return divmod(int(cell), size)
+
+
+def canonical_board(board):
+    """Tahta listesini kanonik tahta listesine çevirir: (kanonik tahta, dönüşüm numarası)"""
+    values = np.array([[" SO".index(cell) for cell in row] for row in board], dtype=np.int8)
+    canonical, transforms = canonicalize_boards(values[None])
+    return [[" SO"[value] for value in row] for row in canonical[0]], int(transforms[0])
+
+
+def canonical_key(board):
+    """Tahta listesi için simetriden bağımsız önbellek anahtarı: (anahtar baytları, dönüşüm numarası)
+
+    Birbirinin döndürülmüşü ya da aynası olan tahtalar aynı anahtarı verir.
+    """
+    values = np.array([[" SO".index(cell) for cell in row] for row in board], dtype=np.int8)
+    canonical, transforms = canonicalize_boards(values[None])
+    return canonical.tobytes(), int(transforms[0])
@@ -0,0 +1,233 @@
+import os  # Dosya/dizin işlemleri için
+import re  # Dosya adından tahta boyutu ve k değerini okumak için
+import sys  # Komut satırı argümanları için
+import time  # Süre ölçümü için
+from itertools import combinations  # Boş hücre kümelerini saymak için
+from math import comb  # Kombinasyon sayıları (mükemmel özet için)
+import numpy as np  # Değer tablosunu bellek eşlemeli dosyada tutmak için
+from sos_lines import get_sos_lines, completed_lines, SOS_MIDDLE  # Önceden hesaplanmış SOS üçlü tabloları
+
+
+# Tablo dosyalarının varsayılan klasörü ve adı
+TABLEBASE_DIR = "tablebases"
+TABLEBASE_NAME = re.compile(r"sos_tb_(\d+)x\1_k(\d+)\.npy$")
+
+# Aşırı büyük tabloları baştan reddetmek için varsayılan kayıt sınırı (1 bayt/kayıt)
+MAX_ENTRIES = 1 << 28
+
+# Yüklenmiş tabloları tutan önbellek (boyut -> tablo ya da None)
+_TABLEBASE_CACHE = {}
+
+
+def tablebase_path(size, max_empty, directory=TABLEBASE_DIR):
+    """Verilen boyut ve k için tablo dosyasının yolu"""
+    return os.path.join(directory, f"sos_tb_{size}x{size}_k{max_empty}.npy")
+
+
+def section_offsets(size, max_empty):
+    """e boş hücreli konumların tablodaki başlangıç indeksleri (e = 0..k) ve toplam kayıt sayısı
+
+    e boş hücreli bölümde C(hücre, e) boş hücre kümesi ve her küme için dolu hücrelerin
+    2^(hücre - e) harf dizilimi vardır.
+    """
+    total_cells = size * size
+    offsets = []
+    total = 0
+    for empty in range(max_empty + 1):
+        offsets.append(total)
+        total += comb(total_cells, empty) << (total_cells - empty)
+    return offsets, total
+
+
+def empty_set_rank(cells):
+    """Sıralı boş hücre kümesinin sırası (colex kombinasyon sıralaması; 0..C(hücre, e)-1)"""
+    return sum(comb(cell, i + 1) for i, cell in enumerate(cells))
+
+
+# Az boş hücreli konumların kesin değerlerini tutan, bellek eşlemeli oyun sonu tablosu
+class EndgameTablebase:
+    """Her kayıt (int8): sıradaki oyuncunun bu konumdan oyun sonuna kadar en iyi oyunla
+    sağlayacağı skor farkı (kendi SOS'ları - rakibin SOS'ları).
+
+    İndeks (mükemmel özet): bölüm başlangıcı[e] + sıra(boş hücreler) * 2^(dolu hücre) + harf bitleri,
+    harf bitleri dolu hücrelerin satır sırasıyla 'O' ise 1, 'S' ise 0 olduğu tamsayıdır.
+    """
+
+    def __init__(self, path):
+        match = TABLEBASE_NAME.search(os.path.basename(path))
+        if match is None:
+            raise ValueError(f"Tablo dosyası adı tanınmadı: {path}")
+
+        self.size = int(match.group(1))  # Tahta boyutu
+        self.max_empty = int(match.group(2))  # Tablodaki en fazla boş hücre sayısı (k)
+        self.total_cells = self.size * self.size
+        self.offsets, total = section_offsets(self.size, self.max_empty)
+
+        self.values = np.load(path, mmap_mode='r')  # Dosya belleğe okunmaz, sayfalar gerektikçe gelir
+        if self.values.shape != (total,):
+            raise ValueError(f"Tablo dosyası bozuk ya da eksik: {path}")
+
+    def index(self, board):
+        """Tahta listesinin tablodaki indeksi; boş hücre sayısı k'dan fazlaysa None"""
+        empty_cells = []
+        bits = 0
+        filled = 0
+        for i, row in enumerate(board):
+            for j, letter in enumerate(row):
+                if letter == ' ':
+                    empty_cells.append(i * self.size + j)
+                else:
+                    if letter == 'O':
+                        bits |= 1 << filled
+                    filled += 1
+
+        empty = len(empty_cells)
+        if empty > self.max_empty:
+            return None
+        return self.offsets[empty] + (empty_set_rank(empty_cells) << filled) + bits
+
+    def value(self, board):
+        """Sıradaki oyuncunun kalan oyundaki en iyi skor farkı; tabloda yoksa None"""
+        index = self.index(board)
+        if index is None:
+            return None
+        return int(self.values[index])
+
+    def best_move(self, board):
+        """Kesin en iyi hamle (row, col, letter); konum tabloda yoksa ya da tahta doluysa None
+
+        Eşit değerli hamlelerden satır sırasıyla ilki ('S' önce) seçilir.
+        """
+        board = [list(row) for row in board]
+        if self.index(board) is None:
+            return None
+
+        best = None
+        best_value = None
+        for i in range(self.size):
+            for j in range(self.size):
+                if board[i][j] != ' ':
+                    continue
+                for letter in ('S', 'O'):
+                    formed = bool(completed_lines(board, i, j, letter))
+                    board[i][j] = letter
+                    child = self.value(board)
+                    board[i][j] = ' '
+
+                    # SOS yapan tekrar oynar; yapmayanın değeri rakibin değerinin tersidir
+                    value = 1 + child if formed else -child
+                    if best_value is None or value > best_value:
+                        best, best_value = (i, j, letter), value
+
+        return best
+
+
+def build_tablebase(size, max_empty, directory=TABLEBASE_DIR, max_entries=MAX_ENTRIES):
+    """En fazla max_empty boş hücreli tüm konumları geriye doğru (retrograd) çözüp dosyaya yazar
+
+    e boş hücreli konumların değerleri e - 1 boş hücreli bölümden hesaplanır; bir boş hücre
+    kümesi için tüm harf dizilimleri tek bir NumPy vektöründe birlikte çözülür.
+    Dosyanın yolunu döndürür.
+    """
+    total_cells = size * size
+    max_empty = min(max_empty, total_cells)
+    offsets, total = section_offsets(size, max_empty)
+    if total > max_entries:
+        raise ValueError(f"{size}x{size} tahta için k={max_empty} tablosu {total} kayıt tutar "
+                         f"(sınır {max_entries}); daha küçük bir k seçin.")
+
+    lines = get_sos_lines(size)
+    os.makedirs(directory, exist_ok=True)
+    path = tablebase_path(size, max_empty, directory)
+
+    # Önce geçici dosyaya yaz, sonra yeniden adlandır: okuyucu yarım tablo görmez
+    tmp_path = path[:-len(".npy")] + ".tmp.npy"
+    try:
+        values = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.int8, shape=(total,))
+        values[offsets[0]:offsets[0] + (1 << total_cells)] = 0  # Dolu tahta: kalan skor yok
+
+        for empty in range(1, max_empty + 1):
+            filled = total_cells - empty
+            bits = np.arange(1 << filled, dtype=np.int64)  # Dolu hücrelerin tüm harf dizilimleri
+            child_width = 1 << (filled + 1)
+
+            for empty_cells in combinations(range(total_cells), empty):
+                empty_set = set(empty_cells)
+
+                def letter_bits(cell):
+                    """Dolu hücrenin 'O' olup olmadığı (tüm dizilimler için)"""
+                    position = cell - sum(1 for e in empty_cells if e < cell)  # Dolu hücreler arasındaki sırası
+                    return (bits >> position) & 1
+
+                best = np.full(len(bits), -127, dtype=np.int8)
+                for cell in empty_cells:
+                    row, col = divmod(cell, size)
+                    child_cells = [e for e in empty_cells if e != cell]
+                    child_base = offsets[empty - 1] + empty_set_rank(child_cells) * child_width
+                    position = cell - sum(1 for e in empty_cells if e < cell)  # Çocukta harfin bit sırası
+                    low = bits & ((1 << position) - 1)
+                    high = (bits >> position) << (position + 1)
+
+                    for letter_bit, letter in ((0, 'S'), (1, 'O')):
+                        # Bu hamle hangi dizilimlerde SOS tamamlar?
+                        formed = np.zeros(len(bits), dtype=bool)
+                        for role, r1, c1, r2, c2, _ in lines[row][col]:
+                            first, second = r1 * size + c1, r2 * size + c2
+                            if first in empty_set or second in empty_set:
+                                continue
+                            if role == SOS_MIDDLE:
+                                if letter == 'O':
+                                    formed |= (letter_bits(first) == 0) & (letter_bits(second) == 0)
+                            elif letter == 'S':
+                                formed |= (letter_bits(first) == 1) & (letter_bits(second) == 0)
+
+                        child = values[child_base + (low | (letter_bit << position) | high)].astype(np.int16)
+                        move_value = np.where(formed, 1 + child, -child)
+                        np.maximum(best, move_value.astype(np.int8), out=best)
+
+                start = offsets[empty] + empty_set_rank(empty_cells) * (1 << filled)
+                values[start:start + len(bits)] = best
+
+            print(f"{empty} boş hücreli konumlar çözüldü")  # Durum bildirimi
+
+        values.flush()
+        del values
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)  # Kurulum yarıda kaldıysa geçici dosya klasörde birikmesin
+    _TABLEBASE_CACHE.pop(size, None)  # Yeni tablo bir sonraki aramada yüklensin
+    return path
+
+
+def get_tablebase(size, directory=TABLEBASE_DIR):
+    """Verilen boyut için klasördeki en büyük k'lı tabloyu (bir kez) yükler; yoksa None"""
+    if size in _TABLEBASE_CACHE:
+        return _TABLEBASE_CACHE[size]
+
+    tablebase = None
+    if os.path.isdir(directory):
+        candidates = []
+        for name in os.listdir(directory):
+            match = TABLEBASE_NAME.fullmatch(name)
+            if match and int(match.group(1)) == size:
+                candidates.append((int(match.group(2)), name))
+        if candidates:
+            _, name = max(candidates)
+            tablebase = EndgameTablebase(os.path.join(directory, name))
+
+    _TABLEBASE_CACHE[size] = tablebase
+    return tablebase
+
+
+# Komut satırından tablo oluşturma: python tablebase.py <boyut> <k>
+if __name__ == "__main__":
+    start_time = time.time()  # Başlangıç zamanını al
+
+    board_size = int(sys.argv[1]) if len(sys.argv) > 1 else 4  # Tahta boyutu
+    max_empty = int(sys.argv[2]) if len(sys.argv) > 2 else 4  # En fazla boş hücre sayısı
+
+    print(f"Tablo dosyası: {build_tablebase(board_size, max_empty)}")
+
+    elapsed_time = time.time() - start_time  # Geçen süreyi hesapla
+    print(f"Toplam süre: {elapsed_time:.2f} saniye")  # Süreyi yazdır
@@ -0,0 +1,103 @@
+from sos_lines import get_sos_lines, SOS_MIDDLE  # Önceden hesaplanmış SOS üçlü tabloları
+
+
+# Şu an bir SOS tamamlayacak (hücre, harf) çiftlerini hamle başına O(1) güncelleyen indeks
+class ThreatIndex:
+    def __init__(self, size):
+        self.size = size  # Tahta boyutu
+        self.lines = get_sos_lines(size)  # Her hücrenin ait olduğu SOS üçlüleri
+
+        # İndeksin kendi tahta kopyası (sadece oynanan hamlelerle güncellenir)
+        self.grid = [[' ' for _ in range(size)] for _ in range(size)]
+
+        # (satır, sütun, harf) -> bu hamlenin tamamlayacağı SOS üçlüsü sayısı (sadece > 0 olanlar)
+        self.counts = {}
+
+    def _add(self, key, delta):
+        """Bir (hücre, harf) çiftinin tamamladığı üçlü sayısını değiştir"""
+        count = self.counts.get(key, 0) + delta
+        if count:
+            self.counts[key] = count
+        else:
+            del self.counts[key]
+
+    def _update(self, row, col, letter, sign):
+        """(row, col) hücresinden geçen üçlülerin tehditlerini ekle (+1) ya da çıkar (-1)"""
+        grid = self.grid
+
+        for role, r1, c1, r2, c2, _ in self.lines[row][col]:
+            # Üçlüde bu hücreye, birinci ve ikinci hücreye gereken harfler
+            if role == SOS_MIDDLE:
+                need_self, need_first = 'O', 'S'
+            else:
+                need_self, need_first = 'S', 'O'
+
+            first = grid[r1][c1]
+            second = grid[r2][c2]
+
+            if first == need_first and second == 'S':
+                # Hücre boşken bu üçlü, hücrenin kendisinde bir tehditti
+                self._add((row, col, need_self), -sign)
+            elif letter == need_self:
+                # Hücre doluyken üçlünün kalan tek boş hücresi tehdit olur
+                if first == ' ' and second == 'S':
+                    self._add((r1, c1, need_first), sign)
+                elif second == ' ' and first == need_first:
+                    self._add((r2, c2, 'S'), sign)
+
+    def place(self, row, col, letter):
+        """Oynanan hamleyi indekse işle"""
+        self._update(row, col, letter, 1)
+        self.grid[row][col] = letter
+
+    def remove(self, row, col):
+        """Geri alınan hamleyi indeksten çıkar"""
+        letter = self.grid[row][col]
+        self.grid[row][col] = ' '
+        self._update(row, col, letter, -1)
+
+    def completes_sos(self, row, col, letter):
+        """Bu hamle şu an bir SOS tamamlar mı?"""
+        return (row, col, letter) in self.counts
+
+    def first_threat(self):
+        """Satır sırasıyla ('S' önce) ilk SOS tamamlayan hamleyi döndürür, yoksa None"""
+        if not self.counts:
+            return None
+        return min(self.counts, key=lambda move: (move[0], move[1], move[2] != 'S'))
+
+    def count_after(self, row, col, letter):
+        """(row, col) hücresine letter konursa SOS tamamlayacak (hücre, harf) çifti sayısı
+
+        Tüm tahtayı taramak yerine sadece bu hücreden geçen üçlülere bakar: hamle
+        hücrenin kendi tehditlerini kaldırır, yalnızca bu üçlülerde yeni tehdit doğurabilir.
+        """
+        counts = self.counts
+        grid = self.grid
+
+        # Mevcut tehditler, bu hücredekiler hariç (hücre artık dolu olacak)
+        total = len(counts) - ((row, col, 'S') in counts) - ((row, col, 'O') in counts)
+
+        new_threats = set()  # Hamlenin doğurduğu, daha önce olmayan tehditler
+        for role, r1, c1, r2, c2, _ in self.lines[row][col]:
+            if role == SOS_MIDDLE:
+                need_self, need_first = 'O', 'S'
+            else:
+                need_self, need_first = 'S', 'O'
+
+            if letter != need_self:
+                continue  # Bu harf bu üçlüde SOS'a katkı vermez
+
+            first = grid[r1][c1]
+            second = grid[r2][c2]
+            if first == ' ' and second == 'S':
+                key = (r1, c1, need_first)
+            elif second == ' ' and first == need_first:
+                key = (r2, c2, 'S')
+            else:
+                continue
+
+            if key not in counts:
+                new_threats.add(key)
+
+        return total + len(new_threats)
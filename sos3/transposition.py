@@ -0,0 +1,43 @@
+# Kayıtlı değerin türü: tam değer, alt sınır (beta kesmesi), üst sınır (hiçbir hamle alfayı geçmedi)
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+# Sabit boyutlu, derinliği tercih eden değiştirme politikasıyla çalışan transpozisyon tablosu
+class TranspositionTable:
+    """Her anahtar tek bir yuvaya (anahtar & maske) düşer; tablo hiç büyümez.
+
+    Yuva doluysa yeni kayıt ancak aynı konuma aitse ya da en az eski kayıt kadar derin
+    aranmışsa yazılır, böylece pahalı alt ağaçların sonuçları sığ sonuçlarla ezilmez.
+    """
+
+    def __init__(self, capacity=1 << 18):
+        # Kapasite ikinin kuvvetine yuvarlanır (indeks = anahtar & maske)
+        self.capacity = 1 << max(0, capacity - 1).bit_length()
+        self.mask = self.capacity - 1
+        self.slots = [None] * self.capacity  # (anahtar, derinlik, değer, tür, en iyi hamle)
+
+        self.hits = 0  # Bulunan kayıt sayısı
+        self.misses = 0  # Bulunamayan kayıt sayısı
+        self.stores = 0  # Yazılan kayıt sayısı
+
+    def probe(self, key):
+        """Anahtarın kaydını (derinlik, değer, tür, en iyi hamle) olarak döndürür, yoksa None"""
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:]
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value, flag, move=None):
+        """Kaydı yazar; yuvadaki başka bir konumun daha derin kaydı korunur"""
+        index = key & self.mask
+        entry = self.slots[index]
+        if entry is None or entry[0] == key or depth >= entry[1]:
+            self.slots[index] = (key, depth, value, flag, move)
+            self.stores += 1
+
+    def clear(self):
+        """Tüm kayıtları ve sayaçları siler"""
+        self.slots = [None] * self.capacity
+        self.hits = self.misses = self.stores = 0
@@ -0,0 +1,251 @@
+import hashlib  # Oyun kayıtlarının özetini karşılaştırmak için
+import numpy as np  # Binlerce oyunu tek dizide ilerletmek için
+from sos_lines import get_sos_lines, SOS_MIDDLE  # Önceden hesaplanmış SOS üçlü tabloları
+from game_record import GameRecord  # Sıkıştırılmış oyun kaydı
+
+
+# Hücre değerleri (özelliklerle aynı): 0 boş, 1 'S', 2 'O'
+EMPTY, S_VALUE, O_VALUE = 0, 1, 2
+
+# Tahta boyutuna göre hesaplanmış dizi tablolarını tutan önbellek
+_TABLE_CACHE = {}
+
+
+def get_vector_tables(size):
+    """Her hücrenin SOS üçlülerini (hücre sayısı, K) boyutlu dizilere çevirir (boyut başına bir kez)
+
+    K bir hücrenin en fazla ait olduğu üçlü sayısıdır; eksik kayıtlar tahtanın dışındaki
+    her zaman boş olan dolgu hücresini (indeks size * size) gösterir ve hiçbir harfle eşleşmez.
+    """
+    if size in _TABLE_CACHE:
+        return _TABLE_CACHE[size]
+
+    lines = get_sos_lines(size)
+    total_cells = size * size
+    max_lines = max(len(lines[r][c]) for r in range(size) for c in range(size))
+
+    # Üçlüdeki diğer iki hücre ve onlara gereken harfler, bu hücreye gereken harf
+    other1 = np.full((total_cells, max_lines), total_cells, dtype=np.intp)
+    other2 = np.full((total_cells, max_lines), total_cells, dtype=np.intp)
+    need1 = np.zeros((total_cells, max_lines), dtype=np.int8)
+    need2 = np.zeros((total_cells, max_lines), dtype=np.int8)
+    need_self = np.zeros((total_cells, max_lines), dtype=np.int8)
+
+    for r in range(size):
+        for c in range(size):
+            cell = r * size + c
+            for k, (role, r1, c1, r2, c2, _) in enumerate(lines[r][c]):
+                other1[cell, k] = r1 * size + c1
+                other2[cell, k] = r2 * size + c2
+                need2[cell, k] = S_VALUE
+                if role == SOS_MIDDLE:
+                    need_self[cell, k], need1[cell, k] = O_VALUE, S_VALUE  # S-[O]-S
+                else:
+                    need_self[cell, k], need1[cell, k] = S_VALUE, O_VALUE  # [S]-O-S
+
+    # Üçlünün kalan boş hücresi tehdit olursa oluşacak (hücre, harf) anahtarı: hücre * 2 + harf
+    key1 = other1 * 2 + (need1 == O_VALUE)
+    key2 = other2 * 2 + (need2 == O_VALUE)
+
+    tables = {
+        "other1": other1,
+        "other2": other2,
+        "need1": need1,
+        "need2": need2,
+        "need_self": need_self,
+        "key1": key1,
+        "key2": key2,
+    }
+    _TABLE_CACHE[size] = tables
+    return tables
+
+
+# Binlerce SOS oyununu tek bir NumPy dizisinde adım adım ilerleten ortam
+class VectorSOSEnv:
+    def __init__(self, num_games, size=5, seed=None):
+        self.num_games = num_games  # Aynı anda oynanan oyun sayısı
+        self.size = size  # Tahta boyutu
+        self.total_cells = size * size  # Toplam hücre sayısı
+        self.tables = get_vector_tables(size)  # Üçlü tabloları
+        self.rng = np.random.default_rng(seed)  # Oyunlara özel rastgele sayı üreteci
+
+        # Tahtalar: (oyun, hücre + 1); son sütun her zaman boş dolgu hücresi
+        self.boards = np.zeros((num_games, self.total_cells + 1), dtype=np.int8)
+        self.current_player = np.ones(num_games, dtype=np.int8)  # Sıradaki oyuncu (1 ya da 2)
+        self.scores = np.zeros((num_games, 2), dtype=np.int16)  # Oyuncu skorları
+        self.move_count = np.zeros(num_games, dtype=np.int16)  # Oynanan hamle sayısı
+        self.done = np.zeros(num_games, dtype=bool)  # Oyun bitti mi?
+
+        # Hamle kayıtları (GameRecord kodlarıyla aynı; oynanmamış hamleler -1)
+        self.codes = np.full((num_games, self.total_cells), -1, dtype=np.int16)
+
+    def _line_values(self):
+        """Her (oyun, hücre, üçlü) için diğer iki hücrenin değerleri"""
+        cells = self.boards
+        return cells[:, self.tables["other1"]], cells[:, self.tables["other2"]]
+
+    def threats(self):
+        """(oyun, hücre, harf) boyutlu dizi: bu hamle şu an bir SOS tamamlar mı? (harf 0 'S', 1 'O')"""
+        t = self.tables
+        v1, v2 = self._line_values()
+        complete = (v1 == t["need1"]) & (v2 == t["need2"])  # Üçlünün diğer iki hücresi hazır
+        empty = self.boards[:, :self.total_cells] == EMPTY
+
+        s_threats = (complete & (t["need_self"] == S_VALUE)).any(axis=2) & empty
+        o_threats = (complete & (t["need_self"] == O_VALUE)).any(axis=2) & empty
+        return np.stack([s_threats, o_threats], axis=2)
+
+    def step(self, cells, letters):
+        """Bitmemiş her oyunda bir hamle yapar (letters: 0 'S', 1 'O'); SOS oluşanları döndürür"""
+        t = self.tables
+        games = np.flatnonzero(~self.done)
+        cells = np.asarray(cells)[games]
+        letters = np.asarray(letters)[games]
+        values = (letters + 1).astype(np.int8)
+
+        # Hamlenin bir SOS tamamlayıp tamamlamadığı (sadece bu hücrenin üçlüleri)
+        v1 = self.boards[games[:, None], t["other1"][cells]]
+        v2 = self.boards[games[:, None], t["other2"][cells]]
+        formed = ((t["need_self"][cells] == values[:, None]) &
+                  (v1 == t["need1"][cells]) & (v2 == t["need2"][cells])).any(axis=1)
+
+        self.boards[games, cells] = values
+        self.codes[games, self.move_count[games]] = cells * 4 + letters * 2 + formed
+        self.move_count[games] += 1
+
+        # SOS yapan oyuncu puan alır ve tekrar oynar, yapmayanın sırası geçer
+        players = self.current_player[games]
+        self.scores[games, players - 1] += formed
+        self.current_player[games] = np.where(formed, players, 3 - players)
+
+        self.done[games] = self.move_count[games] == self.total_cells
+
+        result = np.zeros(self.num_games, dtype=bool)
+        result[games] = formed
+        return result
+
+    def easy_moves(self):
+        """Kolay politika: her oyunda rastgele boş hücre ve rastgele harf (hücre, harf) dizileri"""
+        keys = self.rng.random((self.num_games, self.total_cells))
+        keys[self.boards[:, :self.total_cells] != EMPTY] = -1.0  # Dolu hücreler seçilmez
+        cells = keys.argmax(axis=1)
+        letters = self.rng.integers(0, 2, self.num_games)
+        return cells, letters
+
+    def hard_moves(self):
+        """Zor politika: SOSBoard.rule_based_move_hard ile aynı hamleyi tüm oyunlar için seçer"""
+        t = self.tables
+        num_games, total_cells = self.num_games, self.total_cells
+        v1, v2 = self._line_values()
+        threats = self.threats()
+        empty = self.boards[:, :total_cells] == EMPTY
+
+        # 1-2. SOS tamamlayan ilk hamle (satır sırasıyla, 'S' önce)
+        flat_threats = threats.reshape(num_games, 2 * total_cells)
+        has_threat = flat_threats.any(axis=1)
+        first_threat = flat_threats.argmax(axis=1)
+
+        # 3. Stratejik puan: önce her harf için sezgisel puan
+        is_end = t["need_self"] == S_VALUE
+        is_mid = t["need_self"] == O_VALUE
+        s_score = (is_end & (v2 == EMPTY) & (v1 == O_VALUE)) * 2 + (is_end & (v2 == EMPTY) & (v1 == EMPTY))
+        one_s = ((v1 == S_VALUE) & (v2 == EMPTY)) | ((v1 == EMPTY) & (v2 == S_VALUE))
+        o_score = (is_mid & (v1 == S_VALUE) & (v2 == S_VALUE)) * 10 + (is_mid & one_s) * 3
+        heuristic = np.stack([s_score.sum(axis=2), o_score.sum(axis=2)], axis=2)
+
+        # Rakip cezası: hamleden sonra SOS tamamlayan (hücre, harf) çifti sayısı
+        base = threats.sum(axis=(1, 2))[:, None]  # Mevcut tehdit sayısı
+        at_cell = threats.sum(axis=2)  # Bu hücredeki tehditler (hücre dolunca kalkar)
+
+        # Dolgu hücresinin anahtarları için iki sütun eklenir (hiçbiri tehdit değildir)
+        padded_threats = np.concatenate([flat_threats, np.zeros((num_games, 2), dtype=bool)], axis=1)
+        known1 = padded_threats[:, t["key1"]]  # Birinci hücredeki tehdit zaten var mı?
+        known2 = padded_threats[:, t["key2"]]  # İkinci hücredeki tehdit zaten var mı?
+
+        penalty = np.empty((num_games, total_cells, 2), dtype=np.int32)
+        for letter, value in ((0, S_VALUE), (1, O_VALUE)):
+            # Hamlenin doğurduğu, daha önce olmayan tehditler (üçlünün birinci ya da ikinci hücresinde)
+            active = t["need_self"] == value
+            new1 = active & (v1 == EMPTY) & (v2 == t["need2"]) & ~known1
+            new2 = active & (v2 == EMPTY) & (v1 == t["need1"]) & ~known2
+            # (aynı hücreden geçen iki üçlü aynı (hücre, harf) tehdidini doğuramaz, çift sayım olmaz)
+            new_count = new1.sum(axis=2) + new2.sum(axis=2)
+
+            penalty[:, :, letter] = base - at_cell + new_count
+
+        scores = heuristic - 5 * penalty
+
+        # En yüksek (puan, satır, sütun, harf) dörtlüsü: eşitlikte büyük hücre ve 'S' kazanır
+        order = np.arange(total_cells)[:, None] * 2 + np.array([1, 0])
+        ranking = scores.astype(np.int64) * (2 * total_cells) + order
+        ranking[~empty] = np.iinfo(np.int64).min  # Dolu hücreler seçilmez
+        best = ranking.reshape(num_games, -1).argmax(axis=1)
+        best_cells, best_letters = best // 2, best % 2
+
+        cells = np.where(has_threat, first_threat // 2, best_cells)
+        letters = np.where(has_threat, first_threat % 2, best_letters)
+        return cells, letters
+
+    def policy_moves(self, difficulty):
+        """Zorluk seviyesine göre tüm oyunlar için (hücre, harf) dizileri"""
+        if difficulty == "easy":
+            return self.easy_moves()
+        if difficulty == "medium":
+            # %70 zor, %30 kolay (her oyun için ayrı kura)
+            hard_cells, hard_letters = self.hard_moves()
+            easy_cells, easy_letters = self.easy_moves()
+            use_hard = self.rng.random(self.num_games) < 0.7
+            return np.where(use_hard, hard_cells, easy_cells), np.where(use_hard, hard_letters, easy_letters)
+        return self.hard_moves()
+
+    def play(self, player1_diff="hard", player2_diff="hard"):
+        """Tüm oyunları bitene kadar oynatır ve GameRecord listesi döndürür"""
+        while not self.done.all():
+            # Seviyeler sabit sırayla hesaplanır (küme sırası PYTHONHASHSEED'e bağlıdır ve
+            # self.rng çağrılarının sırasını, dolayısıyla aynı tohumla oynanan oyunları değiştirirdi)
+            moves = {diff: self.policy_moves(diff) for diff in dict.fromkeys((player1_diff, player2_diff))}
+            first = self.current_player == 1
+            cells = np.where(first, moves[player1_diff][0], moves[player2_diff][0])
+            letters = np.where(first, moves[player1_diff][1], moves[player2_diff][1])
+            self.step(cells, letters)
+
+        return self.records()
+
+    def records(self):
+        """Oyunların hamle kayıtlarını GameRecord olarak döndürür"""
+        return [GameRecord(self.size, self.codes[i, :self.move_count[i]].tolist())
+                for i in range(self.num_games)]
+
+
+def records_digest(records):
+    """Oyun kayıtlarının SHA-1 özeti (aynı oyunlar aynı özeti verir)"""
+    digest = hashlib.sha1()
+    for record in records:
+        digest.update(repr(list(record)).encode())
+    return digest.hexdigest()
+
+
+# Tekrarlanabilirlik kontrolü: python vector_env.py
+# Aynı tohumla oynanan oyunlar, farklı PYTHONHASHSEED ile çalışan süreçlerde aynı olmalıdır
+if __name__ == "__main__":
+    import os
+    import subprocess
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--digest":
+        # Alt süreç: rastgele sayı çeken iki seviyeyle oynatıp özeti yazdır
+        print(records_digest(VectorSOSEnv(64, 5, seed=123).play("easy", "medium")))
+        sys.exit(0)
+
+    digests = {}
+    for hash_seed in ("1", "7"):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--digest"], env=env,
+                                capture_output=True, text=True, check=True).stdout
+        digests[hash_seed] = output.strip()
+        print(f"PYTHONHASHSEED={hash_seed}: {digests[hash_seed]}")
+
+    if len(set(digests.values())) != 1:
+        print("Aynı tohum farklı oyunlar üretti!")
+        sys.exit(1)
+    print("Aynı tohum aynı oyunları üretti.")
@@ -0,0 +1,48 @@
+import random  # Sabit tohumlu rastgele anahtarlar için
+
+
+# Anahtarlar süreçler ve oturumlar arasında aynı olsun diye sabit tohum kullanılır
+ZOBRIST_SEED = 0x5053
+
+# Tahta boyutuna göre oluşturulmuş anahtar tablolarını tutan önbellek
+_HASHER_CACHE = {}
+
+
+# Tahtanın Zobrist anahtarları
+class ZobristHasher:
+    """Tahta anahtarı = dolu hücrelerin (hücre, harf) anahtarlarının XOR'u.
+
+    SOS'ta bir konumun değeri sıradaki oyuncuya ve o ana kadarki skora bağlı olmadığından
+    (bkz. search.AlphaBetaSearch) anahtar sadece tahtayı kapsar.
+
+    Bir hamle tahta anahtarını tek bir XOR ile günceller; aynı konuma farklı hamle
+    sıralarıyla gelinse de anahtar aynıdır.
+    """
+
+    def __init__(self, size):
+        self.size = size  # Tahta boyutu
+        total_cells = size * size
+        rng = random.Random(ZOBRIST_SEED + size)
+
+        # Her hücre için ('S' anahtarı, 'O' anahtarı)
+        self.cell_keys = [(rng.getrandbits(64), rng.getrandbits(64)) for _ in range(total_cells)]
+
+    def move_key(self, row, col, letter):
+        """(row, col) hücresindeki harfin anahtarı (koymak da kaldırmak da bununla XOR'lanır)"""
+        return self.cell_keys[row * self.size + col][letter == 'O']
+
+    def board_key(self, board):
+        """Bir tahta listesinin anahtarını baştan hesaplar"""
+        key = 0
+        for i, row in enumerate(board):
+            for j, letter in enumerate(row):
+                if letter != ' ':
+                    key ^= self.move_key(i, j, letter)
+        return key
+
+
+def get_hasher(size):
+    """Verilen tahta boyutu için (bir kez oluşturulan) Zobrist anahtar tablosu"""
+    if size not in _HASHER_CACHE:
+        _HASHER_CACHE[size] = ZobristHasher(size)
+    return _HASHER_CACHE[size]